@@ -0,0 +1,105 @@
+"""
+Agent Warm-up
+-------------
+Builds a language's agents in a background thread while the start page is idle.
+
+Constructing an agent loads the language's word list and precomputed artifacts
+(pattern matrix, entropy cache, opening book), which is too slow for the GUI
+thread. The start page starts an AgentWarmup once it has drawn its first frame;
+mode windows then take ready-made agents from it instead of building their own.
+Switching language or quitting cancels the pending work.
+
+The thread is a daemon, so an agent still being built when the application
+exits is stopped wherever it is. The caches it may be writing (entropy cache,
+pattern counts) are written to a temporary file and moved into place, so an
+interrupted build leaves the previous file, or none, and never a truncated one.
+"""
+
+import threading
+
+from agents.registry import get_agent_class
+
+# The most expensive agent first: it is the one most worth having ready.
+WARMUP_ORDER = ("Entropy", "Bayesian", "Frequency", "CSP")
+
+
+class AgentWarmup:
+    def __init__(self, language):
+        self.language = language
+        # Agent names still to build, in order, and built agents (or the error raised) by name.
+        # A single worker builds them, since agents share per-language state built on first use.
+        self._pending = []
+        self._ready = {}
+        self._building = None
+        self._cancelled = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="agent-warmup", daemon=True)
+
+    def start(self):
+        """Start building one agent of every kind."""
+        if self._thread.ident is not None:
+            return
+        with self._condition:
+            self._pending = list(WARMUP_ORDER)
+        self._thread.start()
+
+    def prioritize(self, agent_name):
+        """Build this agent next if it is not ready yet (e.g. it was just selected)."""
+        with self._condition:
+            if agent_name in self._pending:
+                self._pending.remove(agent_name)
+                self._pending.insert(0, agent_name)
+                self._condition.notify_all()
+
+    def take(self, agent_name):
+        """
+        Return a constructed agent, waiting for it if it is still being built.
+
+        Another instance is queued right away, so the next window gets a ready one as well.
+        """
+        if self._thread.ident is None:
+            self.start()
+        with self._condition:
+            if self._cancelled:
+                raise RuntimeError("Agent warm-up was cancelled")
+            if agent_name not in self._ready and agent_name != self._building:
+                if agent_name in self._pending:
+                    self._pending.remove(agent_name)
+                self._pending.insert(0, agent_name)
+                self._condition.notify_all()
+            while agent_name not in self._ready:
+                self._condition.wait()
+            agent = self._ready.pop(agent_name)
+            self._pending.append(agent_name)
+            self._condition.notify_all()
+        if isinstance(agent, Exception):
+            raise agent
+        return agent
+
+    def cancel(self):
+        """Drop all pending work; an agent already being built is finished and discarded."""
+        with self._condition:
+            self._cancelled = True
+            self._pending.clear()
+            self._ready.clear()
+            self._condition.notify_all()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._cancelled:
+                    self._condition.wait()
+                if self._cancelled:
+                    return
+                agent_name = self._pending.pop(0)
+                self._building = agent_name
+            try:
+                agent = get_agent_class(agent_name)(language=self.language)
+            except Exception as error:
+                agent = error
+            with self._condition:
+                self._building = None
+                if self._cancelled:
+                    return
+                self._ready[agent_name] = agent
+                self._condition.notify_all()
@@ -18,16 +18,19 @@ from UI.ui_helper import get_language_ui_config
 from utils.word_processing.validation import is_valid_word
 from data.config import ERROR_WORDS
 class ComparisonWindow(QMainWindow):
-    def __init__(self,language):
+    def __init__(self,language, agents=None):
         """
-        Expects four AI agent classes. Instances are created for each agent.
+        Expects four AI agent classes. Instances are created for each agent,
+        unless ready-made instances are passed in `agents` (in the same order).
         """
         super().__init__()
         self.env = WordleEnv(language=language)
         self.language = language
         self.translate = translations[self.language]
         self.secret_word = self.env.generate_random_word()
-        self.agents = [FrequencyAgent(language=language),EntropyAgent(language=language),BayesianAgent(language=language),CSP_agent(language=language)]
+        if agents is None:
+            agents = [FrequencyAgent(language=language),EntropyAgent(language=language),BayesianAgent(language=language),CSP_agent(language=language)]
+        self.agents = agents
         self.ai_threads = []  # To hold solver threads for each agent
         self.boards = []  # To hold the four game boards
         self.init_ui()
@@ -203,7 +206,7 @@ class ComparisonWindow(QMainWindow):
         elif word not in self.agents[0].candidates:
             if is_valid_word(word):
                 for agent in self.agents:
-                    agent.candidates.append(word)
+                    agent.add_candidate(word)
             else:
                 ERROR_WORDS.append(word)
                 self.__show_temp_message(self.translate["not_in_word_list"])
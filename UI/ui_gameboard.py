@@ -1,6 +1,7 @@
 from PyQt6.QtWidgets import QWidget, QVBoxLayout,QHBoxLayout, QLabel, QGridLayout,QSizePolicy
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QFont
+from core.feedback import color_name
 
 class GameBoard(QWidget):
     def __init__(self, title, language = "en"):
@@ -68,6 +69,9 @@ class GameBoard(QWidget):
         cell = self.cells.get((row, col))
         if cell:
             cell.setText(letter)
+            # Agents work with numeric feedback; accept a digit (0-2) as well as a color name.
+            if color is not None:
+                color = color_name(color)
             if color == "green":
                 cell.setStyleSheet("""
                     background-color: #6aaa64;
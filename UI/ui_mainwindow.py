@@ -13,6 +13,7 @@ from UI.translations import translations,get_translation_key
 from UI.ui_helper import get_language_ui_config
 from utils.word_processing.validation import is_valid_word
 from data.config import ERROR_WORDS
+from core.feedback import as_color_names
 class MainWindow(QMainWindow):
     def __init__(self,selected_agent , language):
         super().__init__()
@@ -20,7 +21,8 @@ class MainWindow(QMainWindow):
         self.env = WordleEnv(language= language)
         self.ai_thread = None
         self.current_player_row = 0
-        self.agent = selected_agent(language = language)
+        # An agent class, or an instance already built (e.g. by the start page's warm-up).
+        self.agent = selected_agent(language = language) if isinstance(selected_agent, type) else selected_agent
         self.is_play_mode = False
         self.keyboard = KeyboardWidget(self.language)
         self.translate = translations[self.language]
@@ -211,7 +213,7 @@ class MainWindow(QMainWindow):
 
         elif guess not in self.agent.candidates:
             if is_valid_word(guess):
-                self.agent.candidates.append(guess)
+                self.agent.add_candidate(guess)
             else:
                 ERROR_WORDS.append(guess)
                 self.__show_temp_message(self.translate["not_in_word_list"])
@@ -219,7 +221,7 @@ class MainWindow(QMainWindow):
                 return
         
         self.status_label.setText("")
-        feedback = self.env.guess(guess)
+        feedback = as_color_names(self.env.guess(guess))
         for col, (letter, color) in enumerate(zip(guess, feedback)):
             self.player_board.update_cell(self.current_player_row, col, letter.upper(), color)
         
@@ -1,13 +1,7 @@
 from PyQt6.QtWidgets import QMainWindow,QMenu, QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout, QDialog, QApplication, QGraphicsOpacityEffect
 from PyQt6.QtCore import Qt, QPropertyAnimation, QTimer
 from PyQt6.QtGui import QFont, QKeySequence, QShortcut
-from agents.CSP_agent import CSP_agent
-from agents.bayesian_agent import BayesianAgent
-from agents.frequency_agent import FrequencyAgent
-from agents.entropy_agent import EntropyAgent
-from UI.ui_comparison import ComparisonWindow
-from UI.ui_mainwindow import MainWindow
-from UI.ui_testwindow import TestWindow
+from UI.agent_warmup import AgentWarmup
 from UI.translations import translations,get_translation_key
 from UI.ui_helper import get_language_ui_config
 
@@ -18,7 +12,18 @@ class StartPage(QMainWindow):
         self.translate = translations[language]
         self.setWindowTitle(self.translate["window_title"])
         self.selected_agent = None
+        # Builds this language's agents in the background once the page has been drawn.
+        self.warmup = AgentWarmup(language)
+        self._warmup_scheduled = False
+        # Nothing new is built once the application is quitting.
+        QApplication.instance().aboutToQuit.connect(self.warmup.cancel)
         self.init_ui()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self._warmup_scheduled:
+            self._warmup_scheduled = True
+            QTimer.singleShot(0, self.warmup.start)
         
 
     def init_ui(self):
@@ -185,6 +190,8 @@ class StartPage(QMainWindow):
     def restart_with_language(self, new_language):
         if new_language == self.language:
             return
+        # The agents being prepared are for the old language.
+        self.warmup.cancel()
 
         # Create a frameless loading popup with rounded corners
         loading_dialog = QDialog(self)
@@ -266,6 +273,7 @@ class StartPage(QMainWindow):
 
     def select_agent(self, agent_name):
         self.selected_agent = agent_name
+        self.warmup.prioritize(agent_name)
         self.agent_label.setText(self.translate["selected"] + ": " + self.translate[get_translation_key(self.selected_agent)])
         self.mode_label.show()
         for btn in self.mode_buttons:
@@ -285,7 +293,9 @@ class StartPage(QMainWindow):
         self.loading_timer.start(500)  # Show loading dialog only if it takes longer than 300ms
 
         def load_and_transition():
-            self.test_window = TestWindow(self.string_to_agent(self.selected_agent),language=self.language)
+            # Mode windows (and the agents behind them) are only imported when first launched.
+            from UI.ui_testwindow import TestWindow
+            self.test_window = TestWindow(self.warmup.take(self.selected_agent),language=self.language)
             self.test_window.start_page = self
             self.test_window.setWindowTitle(self.translate["window_title_test"].format(agent = self.translate[get_translation_key(self.selected_agent)]))
             self.show_window(self.test_window)
@@ -313,7 +323,8 @@ class StartPage(QMainWindow):
         self.loading_timer.start(500)
 
         def load_and_transition():
-            self.main_window = MainWindow(self.string_to_agent(self.selected_agent),language=self.language)
+            from UI.ui_mainwindow import MainWindow
+            self.main_window = MainWindow(self.warmup.take(self.selected_agent),language=self.language)
             self.main_window.setWindowTitle(self.translate["window_title_play"].format(agent = self.translate[get_translation_key(self.selected_agent)]))
             self.main_window.start_page = self
             self.main_window.is_play_mode = True
@@ -345,7 +356,9 @@ class StartPage(QMainWindow):
         self.loading_timer.start(500)
 
         def load_and_transition():
-            self.comparison_window = ComparisonWindow(language=self.language)
+            from UI.ui_comparison import ComparisonWindow
+            agents = [self.warmup.take(agent_name) for agent_name in ("Frequency", "Entropy", "Bayesian", "CSP")]
+            self.comparison_window = ComparisonWindow(language=self.language, agents=agents)
             self.comparison_window.setWindowTitle(self.translate["window_title_comp"])
             self.comparison_window.start_page = self
             self.show_window(self.comparison_window)
@@ -359,13 +372,3 @@ class StartPage(QMainWindow):
             self.loading_timer.stop()
 
         QTimer.singleShot(0, load_and_transition)
-
-    def string_to_agent(self, agent_name):
-        if agent_name == "Frequency":
-            return FrequencyAgent
-        elif agent_name == "Bayesian":
-            return BayesianAgent
-        elif agent_name == "CSP":
-            return CSP_agent
-        elif agent_name == "Entropy":
-            return EntropyAgent
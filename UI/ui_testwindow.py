@@ -19,7 +19,8 @@ class TestWindow(QMainWindow):
         super().__init__()
         self.language = language
         self.env = WordleEnv(language=language)
-        self.agent = selected_agent(language=language)
+        # An agent class, or an instance already built (e.g. by the start page's warm-up).
+        self.agent = selected_agent(language=language) if isinstance(selected_agent, type) else selected_agent
         self.translate = translations[self.language]
         self.init_ui()
 
@@ -203,7 +204,7 @@ class TestWindow(QMainWindow):
 
         elif word not in self.agent.candidates:
             if is_valid_word(word):
-                self.agent.candidates.append(word)
+                self.agent.add_candidate(word)
             else:
                 ERROR_WORDS.append(word)
                 self.__show_temp_message(self.translate["not_in_word_list"])
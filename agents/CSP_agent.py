@@ -9,27 +9,34 @@ It treats the problem as a process of elimination:
 The algorithm is greedy in that it simply chooses a random candidate from
 the remaining possibilities, relying on the filtering process to gradually
 narrow down to the correct answer.
+
+When the pattern matrix has no row for a guess (it was not built, or the guess was
+added at runtime), feedback is compiled into constraints (a letter at a position,
+not at a position, at least / at most some copies of a letter) that are checked
+against the corpus's inverted indexes, starting from the most selective one (see
+core.constraints), instead of computing the guess's feedback against every word.
 """
 
 import random
+import numpy as np
 from agents.base_agent import BaseAgent
-from data.config import ALL_WORDS_ENGLISH , ALL_WORDS_ARABIC
+from core.constraints import compile_feedback, filter_ids
+from core.feedback import as_feedback_code
 
 
 class CSP_agent(BaseAgent):
     def __init__(self, language="en"):
         # Initialize the base agent with the full word list.
-        super().__init__()
-        self.language = language
-        # Create a copy of the word list to use as our working candidate pool.
+        super().__init__(language)
+        # Create the working candidate pool.
         self.reset()
 
     def reset(self):
         """
         Reset the agent for a new game.
-        Restores the candidate list to the full word list.
+        Restores the candidate pool to the full word list.
         """
-        self.candidates = super().candidates(self.language)
+        self.pool = self.full_pool()
         self.previous_guesses = []
 
     def get_guess(self):
@@ -38,7 +45,7 @@ class CSP_agent(BaseAgent):
         If there are candidates available, choose one at random.
         If not, return None.
         """
-        guess = random.choice(self.candidates) if self.candidates else None
+        guess = random.choice(self.candidates) if self.pool else None
         self.previous_guesses.append(guess)
         return guess
 
@@ -46,8 +53,19 @@ class CSP_agent(BaseAgent):
         """
         Update the candidate list based on the feedback received for a guess.
         Keeps only those words that would produce the same feedback if guessed.
+        Feedback may be a code or a sequence of colors; it is compared as a code.
         """
-        self.candidates = [word for word in self.candidates if self._is_consistent(word, guess, feedback) and word not in self.previous_guesses]
+        code = as_feedback_code(feedback)
+        if self.patterns.has_row(guess):
+            # A comparison with the precomputed matrix row is cheaper than checking constraints.
+            self.filter_pool(guess, code)
+            return
+        constraints = compile_feedback(self.corpus, guess, code)
+        survivors = np.zeros(len(self.corpus), dtype=bool)
+        survivors[filter_ids(self.corpus, self.pool.ids(), constraints)] = True
+        self.pool.set_mask(survivors)
+        for previous in self.previous_guesses:
+            self.pool.discard(previous)
         #print(f"Remaining candidates: {len(self.candidates)}")
 
     def _is_consistent(self, candidate, guess, feedback):
@@ -57,46 +75,26 @@ class CSP_agent(BaseAgent):
         it to the observed feedback.
         Returns True if they match; otherwise, False.
         """
-        return self._get_feedback(guess, candidate) == feedback
+        return self._get_feedback(guess, candidate) == as_feedback_code(feedback)
 
     def _get_feedback(self, guess, secret):
         """
         Compute the Wordle-style feedback for a given guess and secret word.
-        Feedback is represented as a list with 3 possible values:
-          - 'green': Correct letter in the correct position.
-          - 'yellow': Correct letter but in the wrong position.
-          - 'grey': Letter not present in the word.
+        Feedback is represented as a base-3 code with one digit per letter (see core.feedback):
+          - 2 (green): Correct letter in the correct position.
+          - 1 (yellow): Correct letter but in the wrong position.
+          - 0 (grey): Letter not present in the word.
 
-        This function uses a two-pass algorithm:
+        The feedback follows the two-pass rule:
           1. First, mark all positions where the guess exactly matches the secret (green).
           2. Then, for non-green positions, check if the guessed letter is present elsewhere in the secret.
              If so, mark it as yellow, ensuring each letter is only counted once.
+        It is looked up in the language's pattern matrix instead of being recomputed.
 
         Returns:
-            A list of feedback strings, one for each letter in the guess.
+            int: The feedback code.
         """
-        # Initialize feedback with 'grey' for each letter.
-        feedback = ['grey'] * 5
-        # Convert secret word into a list of letters for mutable operations.
-        secret_list = list(secret)
-
-        # First pass: Check for 'green' letters.
-        for i in range(5):
-            if guess[i] == secret[i]:
-                feedback[i] = 'green'
-                # Mark this letter as used by setting it to None.
-                secret_list[i] = None
-
-        # Second pass: Check for 'yellow' letters.
-        for i in range(5):
-            if feedback[i] == 'green':
-                continue  # Skip positions already marked as green.
-            if guess[i] in secret_list:
-                feedback[i] = 'yellow'
-                # Remove the letter from secret_list to prevent duplicate matches.
-                secret_list[secret_list.index(guess[i])] = None
-
-        return feedback
+        return self.patterns.code(guess, secret)
     
     def __str__(self):
         return "CSP"
\ No newline at end of file
@@ -1,17 +1,30 @@
 # agents/base_agent.py
 from abc import ABC, abstractmethod
-from data.config import ALL_WORDS_ENGLISH, ALL_WORDS_ARABIC
+from core.candidates import CandidateSet
+from core.corpus import get_corpus
+from core.pattern_matrix import get_pattern_table
 
 
 class BaseAgent(ABC):
     def __init__(self,language = "en"):
         self.language = language
-        self.candidates = None
-        pass
+        # Shared per-language word index and feedback lookups (pattern matrix).
+        self.corpus = get_corpus(language)
+        self.patterns = get_pattern_table(language)
+        # The candidate pool, as a mask over the corpus.
+        self.pool = None
+        self.previous_guesses = []
 
     @abstractmethod
     def reset(self):
-        """Reset the agent’s state for a new game."""
+        """
+        Reset the agent’s state for a new game.
+
+        After reset() the agent must play exactly as a newly constructed one would, so one
+        instance can be reused for any number of games. It must also stay cheap: per-game
+        state only, never reloading word lists or precomputed artifacts (that is what the
+        constructor is for).
+        """
         pass
 
     @abstractmethod
@@ -28,9 +41,36 @@ class BaseAgent(ABC):
         """String name of the agent."""
         pass
 
-    def candidates(self,language = "en"):
-        """Return a list of all possible candidates. Minding the language."""
-        if self.language == "en":
-            return ALL_WORDS_ENGLISH
-        else:
-            return ALL_WORDS_ARABIC
\ No newline at end of file
+    @property
+    def candidates(self):
+        """The remaining candidate words, in word-list order."""
+        return self.pool.words()
+
+    def word_list(self):
+        """Return the list of all possible words. Minding the language."""
+        return self.corpus.words
+
+    def full_pool(self):
+        """Return a candidate pool holding every word of the language."""
+        return CandidateSet.full(self.corpus)
+
+    def add_candidate(self, word):
+        """Accept a word from outside the word list (e.g. validated in the UI) as a candidate."""
+        self.corpus.add_word(word)
+        self.pool.add(word)
+
+    def filter_pool(self, guess, code):
+        """Keep only candidates that would give `code` for `guess`, and drop previous guesses."""
+        self.pool.intersect(self.patterns.mask(guess, code))
+        for previous in self.previous_guesses:
+            self.pool.discard(previous)
+
+    def get_state(self):
+        """Return a copy of the agent's game state, to be restored with set_state()."""
+        return self.pool.copy(), list(self.previous_guesses)
+
+    def set_state(self, state):
+        """Restore a game state returned by get_state(); the state can be restored again later."""
+        pool, previous_guesses = state
+        self.pool = pool.copy()
+        self.previous_guesses = list(previous_guesses)
@@ -11,24 +11,53 @@ predicted feedback (if that candidate were the true word) with the actual feedba
 received, using an exponential decay function based on the number of mismatches. This
 approach results in a smooth likelihood that helps the agent refine its candidate set
 gradually.
+
+The posterior is a float array over corpus word ids (zero outside the candidate pool),
+and an update is one lookup in the LIKELIHOOD table for the feedback codes of all
+candidates at once.
+
+Two options bound the cost of a turn. With log_space=True the agent keeps
+log-probabilities, adds log-likelihoods (minus the mismatch count) and only normalizes
+when it chooses a guess. A beam (the `beam` most probable candidates, or the most
+probable candidates holding `beam_mass` of the probability) drops the long tail of
+words that the soft likelihood would otherwise keep alive.
 """
 
 import math
 from agents.base_agent import BaseAgent
-from data.config import ALL_WORDS_ENGLISH,ALL_WORDS_ARABIC
+from core.feedback import as_feedback_code, MISMATCHES, NUM_PATTERNS
+import numpy as np
 import random
 
+# LIKELIHOOD[observed][predicted] = exp(-number of positions in which the two codes differ).
+LIKELIHOOD = np.array([[math.exp(-MISMATCHES[predicted][observed]) for predicted in range(NUM_PATTERNS)]
+                       for observed in range(NUM_PATTERNS)])
+# LOG_LIKELIHOOD[observed][predicted] = log(LIKELIHOOD[observed][predicted]), an integer.
+LOG_LIKELIHOOD = -np.array(MISMATCHES, dtype=float).T
+# Candidates whose probability falls to this or below are dropped from the pool.
+MIN_PROBABILITY = 1e-8
+
 class BayesianAgent(BaseAgent):
-    def __init__(self,language="en"):
+    def __init__(self,language="en", log_space=False, beam=None, beam_mass=None):
         """
         Initialize the BayesianAgent with the full list of possible words.
 
         Args:
             word_list (list): A list of candidate words.
+            log_space (bool): Keep log-probabilities, normalized only when a guess is chosen.
+            beam (int): Keep only this many of the most probable candidates after each update
+                (None: no limit).
+            beam_mass (float): Keep only the most probable candidates that together hold this
+                share (0 < beam_mass <= 1) of the probability after each update (None: no limit).
         """
-        super().__init__()
-        self.language = language
-        self.previous_guesses = []
+        super().__init__(language)
+        if beam is not None and beam < 1:
+            raise ValueError(f"Unsupported beam: {beam}")
+        if beam_mass is not None and not 0 < beam_mass <= 1:
+            raise ValueError(f"Unsupported beam mass: {beam_mass}")
+        self.log_space = log_space
+        self.beam = beam
+        self.beam_mass = beam_mass
         # Initialize the agent state.
         self.reset()
 
@@ -38,10 +67,16 @@ class BayesianAgent(BaseAgent):
         Sets the candidate list back to the full word list and assigns a uniform probability
         distribution over all candidates.
         """
-        self.candidates = super().candidates(language=self.language)
+        self.pool = self.full_pool()
         self.previous_guesses = []
-        # Initially, assign each candidate a probability of 1.0.
-        self.probabilities = {word: 1.0 for word in self.candidates}
+        if self.log_space:
+            # Unnormalized log-probabilities (indexed by corpus word id), -inf outside the pool.
+            self.probabilities = None
+            self.log_probabilities = np.zeros(len(self.corpus))
+            return
+        # Initially, assign each candidate a probability of 1.0 (indexed by corpus word id).
+        self.probabilities = np.ones(len(self.corpus))
+        self.log_probabilities = None
         self.normalize_probabilities()
 
     def normalize_probabilities(self):
@@ -49,10 +84,73 @@ class BayesianAgent(BaseAgent):
         Normalize the candidate probabilities so that the total probability sums to 1.
         This is done by dividing each candidate's probability by the total probability.
         """
-        total = sum(self.probabilities.values())
+        ids = self.pool.ids()
+        # Python's sum() over the candidates in word-list order, the same total as the
+        # dict-based posterior of earlier versions, so ties and guesses are unchanged.
+        total = sum(self.probabilities[ids].tolist())
         if total > 0:
-            for word in self.probabilities:
-                self.probabilities[word] /= total
+            self.probabilities[ids] /= total
+
+    def normalize_log_probabilities(self):
+        """
+        Normalize the log-probabilities of the candidates (their exponentials sum to 1) and
+        drop the candidates whose probability is MIN_PROBABILITY or below.
+        """
+        ids = self.pool.ids()
+        if not len(ids):
+            return
+        log_probabilities = self.log_probabilities[ids]
+        top = log_probabilities.max()
+        log_probabilities -= top + np.log(np.exp(log_probabilities - top).sum())
+        self.log_probabilities[ids] = log_probabilities
+        self._keep(ids[log_probabilities > np.log(MIN_PROBABILITY)])
+
+    def _fit_probabilities(self):
+        # The corpus may have grown (words added at runtime) since the posterior was made.
+        if self.log_space:
+            missing = len(self.corpus) - len(self.log_probabilities)
+            if missing > 0:
+                self.log_probabilities = np.concatenate([self.log_probabilities, np.full(missing, -np.inf)])
+            return
+        missing = len(self.corpus) - len(self.probabilities)
+        if missing > 0:
+            self.probabilities = np.concatenate([self.probabilities, np.zeros(missing)])
+
+    def _keep(self, ids):
+        """Reduce the pool to the given corpus ids, clearing the posterior of the others."""
+        if len(ids) == len(self.pool):
+            return
+        mask = np.zeros(len(self.corpus), dtype=bool)
+        mask[ids] = True
+        self.pool.set_mask(mask)
+        if self.log_space:
+            self.log_probabilities[~mask] = -np.inf
+        else:
+            self.probabilities[~mask] = 0.0
+
+    def _apply_beam(self):
+        """Reduce the pool to the candidates inside the beam, if one is set."""
+        if self.beam is None and self.beam_mass is None:
+            return
+        ids = self.pool.ids()
+        scores = self.log_probabilities[ids] if self.log_space else self.probabilities[ids]
+        order = np.argsort(-scores, kind="stable")
+        keep = len(ids)
+        if self.beam is not None:
+            keep = min(keep, self.beam)
+        if self.beam_mass is not None and len(ids):
+            weights = np.exp(scores[order] - scores[order[0]]) if self.log_space else scores[order]
+            mass = np.cumsum(weights)
+            keep = min(keep, int(np.searchsorted(mass, self.beam_mass * mass[-1])) + 1)
+        if keep == len(ids):
+            return
+        # Everything above the score at the cut-off stays; the candidates tied at it are
+        # sampled at random (like tied guesses), not taken in word-list order.
+        cutoff = scores[order[keep - 1]]
+        above = ids[scores > cutoff]
+        tied = ids[scores == cutoff].tolist()
+        chosen = random.sample(tied, keep - len(above))
+        self._keep(np.sort(np.concatenate([above, np.array(chosen, dtype=ids.dtype)])))
 
     def get_guess(self):
         """
@@ -61,19 +159,27 @@ class BayesianAgent(BaseAgent):
         If all guesses have the same probability, a random guess is selected.
 
         Returns:
-            str: The word with the highest probability, or a random word if all probabilities are equal.
+            str: The word with the highest probability, or a random word if all probabilities are equal
+            (None if no candidate is left).
         """
+        if self.log_space:
+            self.normalize_log_probabilities()
+        # A beam can drop every candidate (the secret included) when the feedback contradicts it.
+        if not self.pool:
+            return None
+        ids = self.pool.ids()
+        probabilities = self.log_probabilities[ids] if self.log_space else self.probabilities[ids]
         # Get the maximum probability value
-        max_prob = max(self.probabilities.values(), default=0)
+        max_prob = probabilities.max() if len(ids) else 0
 
         # Find all candidates with the maximum probability
-        best_candidates = [word for word, prob in self.probabilities.items() if prob == max_prob]
+        best_ids = ids[probabilities == max_prob]
 
         # If all candidates have the same probability, select a random guess
-        if len(best_candidates) == len(self.candidates):
+        if len(best_ids) == len(ids):
             best_guess = random.choice(self.candidates)
         else:
-            best_guess = random.choice(best_candidates)
+            best_guess = random.choice([self.corpus.words[i] for i in best_ids])
 
         self.previous_guesses.append(best_guess)
         return best_guess
@@ -84,25 +190,58 @@ class BayesianAgent(BaseAgent):
 
         For each candidate word, compute the likelihood of the observed feedback given that
         candidate. Multiply the candidate's existing probability by the likelihood and then
-        normalize the distribution.
+        normalize the distribution. All candidates are updated at once: their predicted codes
+        come from the pattern matrix row of the guess, their likelihoods from LIKELIHOOD.
 
         Args:
             guess (str): The word that was guessed.
-            feedback (list): The list of feedback strings received (e.g., ['green', 'grey', 'yellow', ...]).
+            feedback (int or list): The feedback code received, or the equivalent list of colors.
         """
-        new_probabilities = {}
-        for word in self.candidates:
-            likelihood = self.likelihood(word, guess, feedback)
-            new_probabilities[word] = self.probabilities[word] * likelihood
+        observed = as_feedback_code(feedback)
+        self._fit_probabilities()
+        candidate_ids = self.pool.ids()
+        codes = self.patterns.row(guess)[candidate_ids]
+        if self.log_space:
+            # Normalization and the MIN_PROBABILITY cut wait until the next guess is chosen.
+            self.log_probabilities[candidate_ids] += LOG_LIKELIHOOD[observed][codes]
+            for previous in self.previous_guesses:
+                self.pool.discard(previous)
+            self.log_probabilities[~self.pool.mask] = -np.inf
+            self._apply_beam()
+            return
+        probabilities = self.probabilities[candidate_ids] * LIKELIHOOD[observed][codes]
 
         # Filter out candidates with extremely low probability to avoid numerical issues.
-        self.probabilities = {word: prob for word, prob in new_probabilities.items() if prob > 1e-8 and word not in self.previous_guesses}
+        # Update the candidate pool to include only those with non-negligible probabilities.
+        survivors = np.zeros(len(self.corpus), dtype=bool)
+        survivors[candidate_ids] = probabilities > MIN_PROBABILITY
+        self.pool.set_mask(survivors)
+        for previous in self.previous_guesses:
+            self.pool.discard(previous)
+        self.probabilities = np.zeros(len(self.corpus))
+        self.probabilities[candidate_ids] = probabilities
+        self.probabilities[~self.pool.mask] = 0.0
+        self._apply_beam()
         self.normalize_probabilities()
-        # Update the candidate list to include only those with non-negligible probabilities.
-        self.candidates = list(self.probabilities.keys())
         #print(f"Remaining candidates: {len(self.candidates)}")
 
 
+    def add_candidate(self, word):
+        """
+        Accept a word from outside the word list as a candidate, giving it an
+        average share of the probability mass.
+        """
+        if word not in self.pool:
+            if self.log_space:
+                self.normalize_log_probabilities()
+            super().add_candidate(word)
+            self._fit_probabilities()
+            if self.log_space:
+                self.log_probabilities[self.corpus.id_of(word)] = np.log(1.0 / len(self.pool))
+                return
+            self.probabilities[self.corpus.id_of(word)] = 1.0 / len(self.pool)
+            self.normalize_probabilities()
+
     def likelihood(self, candidate, guess, feedback):
         """
         Compute the likelihood of observing the given feedback if the candidate were the true word.
@@ -120,62 +259,54 @@ class BayesianAgent(BaseAgent):
         Args:
             candidate (str): A candidate word.
             guess (str): The guessed word.
-            feedback (list): The observed feedback for the guess.
+            feedback (int or list): The observed feedback for the guess.
 
         Returns:
             float: The likelihood value for the candidate.
         """
         # Step 1: Get the feedback we'd expect if this candidate were the correct word
-        predicted_feedback = self.compute_feedback(candidate, guess)
+        predicted_code = self.compute_feedback(candidate, guess)
+        return self._likelihood_from_prediction(predicted_code, as_feedback_code(feedback))
 
-        # Step 2: Count how many feedback positions differ from what was observed
-        error_count = 0
-        for predicted, observed in zip(predicted_feedback, feedback):
-            if predicted != observed:
-                error_count += 1
-
-        # Step 3: Convert the error count to a likelihood using exp decay.
-        # Fewer errors = higher likelihood
-        
-        likelihood_score = math.exp(-error_count)
-        return likelihood_score
+    def _likelihood_from_prediction(self, predicted_code, observed_code):
+        """
+        Steps 2 and 3 of likelihood(): turn a predicted feedback code into a likelihood
+        given the observed feedback code.
+        """
+        # Steps 2 and 3: exp(-number of feedback positions that differ from what was observed),
+        # precomputed for every pair of codes. Fewer errors = higher likelihood
+        return float(LIKELIHOOD[observed_code][predicted_code])
 
     def compute_feedback(self, candidate, guess):
         """
         Compute the Wordle-style feedback for a given candidate word and guess.
 
-        This function uses a two-pass algorithm:
+        The feedback follows the two-pass rule:
           1. First pass: Mark letters that are correct and in the correct position as 'green'.
           2. Second pass: For letters not already marked 'green', mark them 'yellow' if they
              appear elsewhere in the candidate (only counting each occurrence once), otherwise 'grey'.
+        It is looked up in the language's pattern matrix instead of being recomputed.
 
         Args:
             candidate (str): The candidate word (hypothetical secret word).
             guess (str): The guessed word.
 
         Returns:
-            tuple: A tuple of feedback strings (e.g., ('green', 'grey', 'yellow', 'grey', 'green')).
-        """
-        feedback = [None] * len(guess)
-        # Make a mutable copy of candidate letters to track used letters.
-        candidate_letters = list(candidate)
-
-        # First pass: Mark 'green' letters.
-        for i, letter in enumerate(guess):
-            if candidate[i] == letter:
-                feedback[i] = 'green'
-                candidate_letters[i] = None  # Mark this letter as used.
-
-        # Second pass: Mark 'yellow' and 'grey'.
-        for i, letter in enumerate(guess):
-            if feedback[i] is None:  # Only consider letters not marked 'green'.
-                if letter in candidate_letters:
-                    feedback[i] = 'yellow'
-                    # Remove the letter from candidate_letters after matching to prevent double-counting.
-                    candidate_letters[candidate_letters.index(letter)] = None
-                else:
-                    feedback[i] = 'grey'
-
-        return tuple(feedback)
+            int: The feedback code (see core.feedback).
+        """
+        return self.patterns.code(guess, candidate)
+
+    def get_state(self):
+        posterior = self.log_probabilities if self.log_space else self.probabilities
+        return super().get_state(), posterior.copy()
+
+    def set_state(self, state):
+        base_state, posterior = state
+        super().set_state(base_state)
+        if self.log_space:
+            self.log_probabilities = posterior.copy()
+        else:
+            self.probabilities = posterior.copy()
+
     def __str__(self):
         return "Bayesian"
\ No newline at end of file
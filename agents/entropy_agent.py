@@ -1,37 +1,45 @@
 import os
-import json
-import math
+
+import numpy as np
 
 from agents.base_agent import BaseAgent
-from data.config import ALL_WORDS_ENGLISH
-from tqdm import tqdm
-from data.config import cache_path_en,cache_path_ar
+from core.entropy import EntropyEngine
+from core.entropy_cache import (entropy_cache_path, json_entropy_cache_path, load_entropy_cache,
+                                save_entropy_cache, import_json_entropy_cache, build_entropy_cache)
+from core.feedback import as_feedback_code
+from core.move_cache import get_move_cache, position_key
+from core.opening_book import get_opening_book
 class EntropyAgent(BaseAgent):
-    def __init__(self, cache_filename=None,language="en"):
+    def __init__(self, cache_filename=None,language="en", workers=1, backend="thread", use_opening_book=True):
         """
         Initialize the EntropyAgent.
 
         Args:
             all_words (list): Full list of guessable words.
             valid_answers (list): List of valid answer words.
-            cache_filename (str): Filename for storing cached entropy values.
+            cache_filename (str): Filename of the binary entropy cache (see core.entropy_cache).
+            workers (int): Number of workers the entropy computation is sharded across (1 = serial).
+            backend (str): "thread" or "process" worker pool, see core.entropy.
+            use_opening_book (bool): Play the precomputed early moves of core.opening_book when available.
         """
-        super().__init__()
-        self.language = language
+        super().__init__(language)
 
-        self.all_words = super().candidates(language=self.language)
+        # Every word of the language is a possible guess.
+        self.all_words = self.word_list()
+        # Scores all guesses against the candidate pool with array operations.
+        self.engine = EntropyEngine(self.patterns, workers=workers, backend=backend)
+        # Second/third guesses looked up by feedback history instead of computed (None if not built).
+        self.opening_book = get_opening_book(language) if use_opening_book else None
+        # Guesses already computed for a candidate pool, shared with the other entropy agents.
+        self.move_cache = get_move_cache(language, "Entropy")
 
         if cache_filename is None:
-            if self.language == "en":
-                self.cache_filename = cache_path_en
-            elif self.language == "ar":
-                self.cache_filename = cache_path_ar
-            else:
-                raise ValueError(f"Unsupported language: {self.language}")
-
-        # This dictionary caches entropy values computed over the full valid_answers list.
-        self.entropy_cache = {}
-        self.previous_guesses = []
+            self.cache_filename = entropy_cache_path(self.language)
+        else:
+            self.cache_filename = cache_filename
+
+        # Entropy of each word over the full word list, in word-list order (memory-mapped).
+        self.entropy_cache = None
         # Initialize the candidate pool (the current set of valid answers).
         self.reset()
         # Precompute entropy values for the first move if cache is not loaded.
@@ -42,80 +50,53 @@ class EntropyAgent(BaseAgent):
         Reset the agent's state for a new game.
         This resets the candidate pool to the full set of valid answers.
         """
-        self.candidates = list(self.all_words)
+        self.pool = self.full_pool()
         self.previous_guesses = []
+        # (guess, feedback code) pairs played so far, the key into the opening book.
+        self.history = []
 
 
     def _load_or_compute_entropy_cache(self):
         """
         Loads the entropy cache from file if it exists; otherwise computes and caches it.
         Entropy here is computed over the full valid_answers list.
+        A cache built for a different word list is rebuilt, incrementally when possible
+        (see core.entropy_cache); a legacy JSON cache is imported if it matches the word list.
         """
-        if os.path.exists(self.cache_filename):
-            with open(self.cache_filename, "r") as f:
-                self.entropy_cache = json.load(f)
-        else:
+        words = self.corpus.words[:self.corpus.base_size]
+        content_hash = self.corpus.content_hash
+        self.entropy_cache = load_entropy_cache(self.cache_filename, self.language, content_hash)
+        if self.entropy_cache is not None:
+            return
+
+        json_path = json_entropy_cache_path(self.language)
+        entropies = None
+        if not os.path.exists(self.cache_filename) and os.path.exists(json_path):
+            entropies = import_json_entropy_cache(json_path, words)
+            if entropies is not None:
+                print(f"\nImported entropy cache {json_path}\n")
+                save_entropy_cache(self.cache_filename, self.language, content_hash, entropies)
+        if entropies is None:
             print(f"\nComputing entropy cache for language='{self.language}' ...\n")
-            total_answers = len(self.all_words)
-
-            # Initialize progress bar
-            with tqdm(total=len(self.all_words), desc="Computing entropy", unit="word") as pbar:
-                for guess in self.all_words:
-                    feedback_counts = {}
-                    for answer in self.all_words:
-                        fb = self.compute_feedback(guess, answer)
-                        feedback_counts[fb] = feedback_counts.get(fb, 0) + 1
-
-                    # Compute entropy for this guess
-                    entropy = 0.0
-                    for count in feedback_counts.values():
-                        p = count / total_answers
-                        entropy -= p * math.log2(p)
-
-                    self.entropy_cache[guess] = entropy
-                    pbar.update(1)  # Update progress bar
-
-            with open(self.cache_filename, "w", encoding="utf-8") as f:
-                json.dump(self.entropy_cache, f)
+            build_entropy_cache(self.language, words, engine=self.engine, path=self.cache_filename)
             print("Entropy cache computed and saved.")
-
-    
+        self.entropy_cache = load_entropy_cache(self.cache_filename, self.language, content_hash)
 
     def compute_feedback(self, guess, answer):
         """
-        Compute Wordle-style feedback for a given guess and answer.
-        Feedback is represented as a tuple of strings (e.g., ('green', 'grey', 'yellow', 'grey', 'green')).
+        Return the Wordle-style feedback for a given guess and answer.
+        Feedback is represented as a base-3 code between 0 and 242 (see core.feedback).
 
-        Uses a two-pass approach with a letter frequency count to correctly mark duplicates.
+        The feedback is looked up in the language's pattern matrix instead of being recomputed.
 
         Args:
             guess (str): The guessed word.
             answer (str): The actual answer word.
 
         Returns:
-            tuple: The feedback for each letter.
+            int: The feedback code.
         """
-        feedback = [None] * len(guess)
-        # Build frequency dictionary for letters in answer.
-        answer_freq = {}
-        for ch in answer:
-            answer_freq[ch] = answer_freq.get(ch, 0) + 1
-
-        # First pass: mark greens and reduce frequency.
-        for i in range(len(guess)):
-            if guess[i] == answer[i]:
-                feedback[i] = 'green'
-                answer_freq[guess[i]] -= 1
-
-        # Second pass: mark yellows or greys.
-        for i in range(len(guess)):
-            if feedback[i] is None:
-                if guess[i] in answer_freq and answer_freq[guess[i]] > 0:
-                    feedback[i] = 'yellow'
-                    answer_freq[guess[i]] -= 1
-                else:
-                    feedback[i] = 'grey'
-        return tuple(feedback)
+        return self.patterns.code(guess, answer)
 
     def _compute_entropy_over_candidates(self):
         """
@@ -125,60 +106,68 @@ class EntropyAgent(BaseAgent):
         Returns:
             dict: A dictionary mapping guess words to their computed entropy.
         """
-        entropy_dict = {}
-        total_candidates = len(self.candidates)
-        for guess in self.all_words:
-            feedback_counts = {}
-            for answer in self.candidates:
-                fb = self.compute_feedback(guess, answer)
-                feedback_counts[fb] = feedback_counts.get(fb, 0) + 1
-            entropy = 0.0
-            for count in feedback_counts.values():
-                p = count / total_candidates
-                entropy -= p * math.log2(p)
-            entropy_dict[guess] = entropy
-        return entropy_dict
+        entropies = self.engine.entropies(np.arange(len(self.all_words)), self.pool.ids())
+        return dict(zip(self.all_words, entropies.tolist()))
 
     def get_guess(self):
         """
         Return the agent's next guess.
         If the candidate pool is full (start of game), use the precomputed entropy cache.
-        Otherwise, compute the entropy values over the current candidate pool.
+        If the game is still inside the opening book, play the book move.
+        Otherwise, compute the entropy values over the current candidate pool
+        (near-ties are settled with the exact per-word computation, see core.entropy),
+        unless the best guess for this pool is already in the move cache.
         If only one candidate remains, return it immediately.
 
         Returns:
             str: The guess with the highest entropy (i.e., expected information gain).
         """
-        if len(self.candidates) == 1:
+        if len(self.pool) == 1:
             return self.candidates[0]
-        if set(self.candidates) == set(self.all_words):
-            # Choose the word with maximum entropy from cache.
-            best_guess = max(self.all_words, key=lambda word: self.entropy_cache.get(word, 0))
+        book_guess = self._opening_book_guess()
+        if book_guess is not None:
+            best_guess = book_guess
+        elif self.pool.is_full():
+            # Choose the word with maximum entropy from cache (the first one on ties, like max()).
+            best_guess = self.all_words[int(np.argmax(self.entropy_cache))]
         else:
-            entropy_dict = self._compute_entropy_over_candidates()
-            best_guess = max(self.all_words, key=lambda word: entropy_dict.get(word, 0))
-            
+            key = position_key(self.pool)
+            best_guess = self.move_cache.get(key)
+            if best_guess is None:
+                best_id = self.engine.best_guess(np.arange(len(self.all_words)), self.pool.ids())
+                best_guess = self.all_words[best_id]
+                self.move_cache.put(key, best_guess)
+
         self.previous_guesses.append(best_guess)
         return best_guess
 
+    def _opening_book_guess(self):
+        """Return the book move for the current history, or None when out of book."""
+        # Words added at runtime change the candidate pools the book was built for.
+        if self.opening_book is None or len(self.corpus) != self.corpus.base_size:
+            return None
+        return self.opening_book.lookup(self.history)
+
     def update(self, guess, feedback):
         """
         Update the candidate pool based on the feedback from a guess.
         Only keep candidates that would produce the same feedback.
+        Feedback may be a code or a sequence of colors; it is compared as a code.
         """
-        # Ensure the provided feedback is a tuple.
-        if not isinstance(feedback, tuple):
-            feedback = tuple(feedback)
-
-        new_candidates = []
-        for word in self.candidates:
-            if word not in self.previous_guesses:
-                computed_feedback = self.compute_feedback(guess, word)
-                if computed_feedback == feedback:
-                    new_candidates.append(word)
-        self.candidates = new_candidates
-        if len(self.candidates) == 0:
+        code = as_feedback_code(feedback)
+        self.history.append((guess, code))
+        self.filter_pool(guess, code)
+        if not self.pool:
             print("ERROR: No candidates left! Something is wrong.")
+
+    def get_state(self):
+        return super().get_state(), list(self.history)
+
+    def set_state(self, state):
+        base_state, history = state
+        super().set_state(base_state)
+        self.history = list(history)
+
     def __str__(self):
         return "Entropy"
 
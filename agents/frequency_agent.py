@@ -13,21 +13,31 @@ inconsistent with the feedback received.
 """
 
 from agents.base_agent import BaseAgent
-from data.config import ALL_WORDS_ENGLISH,ALL_WORDS_ARABIC
+from core.feedback import as_feedback_code
+from core.move_cache import get_move_cache, position_key
+import numpy as np
 import random
 
 class FrequencyAgent(BaseAgent):
-    def __init__(self,language="en"):
+    def __init__(self,language="en", tie_break="random"):
         """
         Initialize the agent with the list of allowed words.
 
         Args:
             all_words (list): A list of allowed 5-letter words.
+            tie_break (str): How equally scored candidates are settled: "random" picks one at
+                random, "first" picks the first in word-list order (deterministic play).
         """
-        # Store a copy of the allowed words for internal use.
-        super().__init__()
-        self.previous_guesses = []
-        self.language = language
+        super().__init__(language)
+        if tie_break not in ("random", "first"):
+            raise ValueError(f"Unsupported tie break: {tie_break}")
+        self.tie_break = tie_break
+        # Best-scoring candidates already computed for a candidate pool, shared with the
+        # other frequency agents (the tie break is applied after the lookup).
+        self.move_cache = get_move_cache(language, "Frequency")
+        # Letter counts over the whole word list, (corpus size, per-letter),
+        # computed once so reset() only has to point at them.
+        self._full_counts = None
         # Initialize the candidate list by calling reset.
         self.reset()
 
@@ -35,16 +45,48 @@ class FrequencyAgent(BaseAgent):
         """
         Resets the agent for a new game.
 
-        This method resets the candidate list to the full list of allowed words,
+        This method resets the candidate pool to the full list of allowed words,
         preparing the agent for a new game.
         """
-        self.candidates = super().candidates(language=self.language)
+        self.pool = self.full_pool()
         self.previous_guesses = []
+        self._count_pool()
+
+    def _count_pool(self):
+        """
+        Count the letters of the candidates from scratch: how often each letter id occurs
+        (letter_frequency).
+        """
+        if not self.pool.is_full():
+            ids = self.pool.ids()
+            self.letter_frequency = self.corpus.letter_frequencies(ids)
+            return
+        if self._full_counts is None or self._full_counts[0] != len(self.corpus):
+            ids = self.pool.ids()
+            self._full_counts = (len(self.corpus), self.corpus.letter_frequencies(ids))
+        # Never modified in place (see _update_counts), so it can be shared.
+        _, self.letter_frequency = self._full_counts
+
+    def _update_counts(self, previous_mask):
+        """
+        Bring the letter counts from the pool `previous_mask` to the current pool, by
+        subtracting the words that were removed or by recounting the survivors,
+        whichever touches fewer words.
+        """
+        mask = self.pool.mask
+        if len(previous_mask) < len(mask):
+            previous_mask = np.concatenate([previous_mask, np.zeros(len(mask) - len(previous_mask), dtype=bool)])
+        removed = np.flatnonzero(previous_mask & ~mask)
+        if len(self.letter_frequency) != self.corpus.letter_counts.shape[1] or len(removed) > len(self.pool):
+            self._count_pool()
+            return
+        if len(removed):
+            self.letter_frequency = self.letter_frequency - self.corpus.letter_frequencies(removed)
 
     def get_guess(self):
         """
         Choose the next guess based on letter frequency among the current candidates.
-        If all candidates have the same score, a random guess is chosen.
+        If several candidates share the best score, one is chosen according to tie_break.
 
         Returns:
             str: The word with the highest score according to letter frequency, or a random word if scores are equal.
@@ -53,83 +95,80 @@ class FrequencyAgent(BaseAgent):
           1. Calculating how often each letter appears in the candidate words.
           2. Scoring each candidate by summing the frequency of its unique letters.
           3. Returning the candidate with the highest total score.
+        The best-scoring candidates of a pool are kept in the move cache.
         """
-        # If no candidates remain, reset the candidate list.
-        if not self.candidates:
-            self.candidates = ALL_WORDS_ARABIC
-
-        # Compute frequency of each letter across all candidate words.
-        frequency = {}
-        for word in self.candidates:
-            for letter in word:
-                frequency[letter] = frequency.get(letter, 0) + 1
-
-        # Score each candidate by summing the frequency of its unique letters.
-        best_score = -1
-        best_candidates = []
-
-        for word in self.candidates:
-            # Using set(word) to ensure each letter is only counted once.
-            score = sum(frequency.get(letter, 0) for letter in set(word))
-
-            # Check if this candidate has the best score
-            if score > best_score:
-                best_score = score
-                best_candidates = [word]  # reset to this new best candidate
-            elif score == best_score:
-                best_candidates.append(word)  # add this word to the list of best candidates
-
-        # If multiple candidates have the same best score, pick randomly
-        best_word = random.choice(best_candidates)
+        # If no candidates remain, reset the candidate pool to the language's word list.
+        if not self.pool:
+            self.pool = self.full_pool()
+            self._count_pool()
+
+        key = position_key(self.pool)
+        best_candidates = self.move_cache.get(key)
+        if best_candidates is None:
+            best_candidates = self._best_candidates()
+            self.move_cache.put(key, best_candidates)
+
+        # If multiple candidates have the same best score, pick randomly (or the first one).
+        if self.tie_break == "first":
+            best_word = best_candidates[0]
+        else:
+            best_word = random.choice(best_candidates)
         self.previous_guesses.append(best_word)
         return best_word
 
+    def _best_candidates(self):
+        """Return the candidates with the highest letter-frequency score, in word-list order."""
+        ids = self.pool.ids()
+        # Frequency of each letter across all candidate words, kept up to date by update().
+        frequency = self.letter_frequency
+        # Score each candidate by summing the frequency of its unique letters.
+        scores = self.corpus.presence[ids] @ frequency
+        best_ids = ids[scores == scores.max()]
+        return tuple(self.corpus.words[i] for i in best_ids)
+
     def update(self, guess, feedback):
         """
         Update the candidate list based on the guess and the feedback received.
 
         Args:
             guess (str): The word that was guessed.
-            feedback (list): A list of 5 strings representing the feedback ("green", "yellow", or "grey").
+            feedback (int or list): The feedback code received, or the equivalent list of 5 colors.
 
         The update is performed by filtering the current candidate list and retaining only the words
         that would produce the same feedback as received if they were the secret word.
+        The letter counts of the candidates are updated along with them.
         """
-        self.candidates = [word for word in self.candidates if self.match_feedback(word, guess, feedback) and word not in self.previous_guesses]
+        previous_mask = self.pool.mask.copy()
+        self.filter_pool(guess, as_feedback_code(feedback))
+        self._update_counts(previous_mask)
+
+    def add_candidate(self, word):
+        super().add_candidate(word)
+        self._count_pool()
+
+    def get_state(self):
+        return super().get_state(), self.letter_frequency
+
+    def set_state(self, state):
+        base_state, self.letter_frequency = state
+        super().set_state(base_state)
 
     def match_feedback(self, word, guess, feedback):
         """
         Check if a candidate word is consistent with the feedback provided for a given guess.
 
-        This function implements a simplified version of feedback matching:
-          - For "green": the letter must match at that exact position.
-          - For "yellow": the letter must appear somewhere in the word, but not in that position.
-          - For "grey": the letter must not appear in the word at all.
-
-        Note: This simplified approach does not handle multiple occurrences of letters perfectly.
-        when you read this and have questions while I followed this approach across the project I can explain it then
+        The word is consistent when guessing `guess` against it would produce exactly the
+        observed feedback, using the same duplicate-letter rules as every other agent.
 
         Args:
             word (str): A candidate word to test.
             guess (str): The guessed word.
-            feedback (list): The feedback list for the guess.
+            feedback (int or list): The feedback for the guess.
 
         Returns:
             bool: True if the candidate is consistent with the feedback; False otherwise.
         """
-        for i, (letter, fb) in enumerate(zip(guess, feedback)):
-            if fb == "green":
-                if word[i] != letter:
-                    return False
-            elif fb == "yellow":
-                # Letter must appear in the word but not at the same position.
-                if letter not in word or word[i] == letter:
-                    return False
-            elif fb == "grey":
-                # For simplicity, assume grey means the letter is not in the word at all.
-                if letter in word:
-                    return False
-        return True
+        return self.patterns.code(guess, word) == as_feedback_code(feedback)
     
     def __str__(self):
         return "Frequency"
\ No newline at end of file
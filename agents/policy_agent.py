@@ -0,0 +1,122 @@
+"""
+PolicyAgent
+-----------
+AI Algorithm Used: Replay of a Precomputed Decision Tree
+
+This agent plays exactly like a deterministic agent (the entropy agent, or the
+frequency agent with first-in-list tie-breaks) without doing any of its work:
+the agent's complete policy is recorded offline as a tree keyed by feedback
+(see core/policy_tree.py), and every move is a single lookup in that tree.
+
+If the game leaves the tree (feedback no word of the list can produce, or a word
+added at runtime), the agent hands over to the live agent it replays, so it
+never plays differently from it.
+"""
+
+from agents.base_agent import BaseAgent
+from agents.entropy_agent import EntropyAgent
+from agents.frequency_agent import FrequencyAgent
+from core.feedback import as_feedback_code
+from core.policy_tree import get_policy_tree
+
+# The agents a policy tree can be recorded from, by policy name.
+POLICIES = {
+    "entropy": lambda language: EntropyAgent(language=language),
+    "frequency": lambda language: FrequencyAgent(language=language, tie_break="first"),
+}
+
+
+class PolicyAgent(BaseAgent):
+    def __init__(self, language="en", policy="entropy"):
+        """
+        Args:
+            language (str): "en" or "ar".
+            policy (str): The agent whose policy tree is replayed, a key of POLICIES.
+        """
+        super().__init__(language)
+        if policy not in POLICIES:
+            raise ValueError(f"Unsupported policy: {policy}")
+        self.policy = policy
+        self.tree = get_policy_tree(language, policy)
+        if self.tree is None:
+            print(f"No policy tree for policy='{policy}', language='{language}'; playing the live agent.")
+        # The live agent, built on first use, and whether it is playing the current game.
+        self.live_agent = None
+        self.off_tree = False
+        self.reset()
+
+    def reset(self):
+        """Go back to the root of the tree for a new game."""
+        self.node = 0
+        self.history = []
+        self.previous_guesses = []
+        self.pool = None
+        self.off_tree = self.tree is None
+        if self.off_tree:
+            self._leave_tree()
+
+    def get_guess(self):
+        """Return the guess stored at the current node."""
+        if self.off_tree:
+            return self.live_agent.get_guess()
+        guess = self.corpus.words[self.tree.guess(self.node)]
+        self.previous_guesses.append(guess)
+        return guess
+
+    def update(self, guess, feedback):
+        """Follow the edge of the observed feedback, or hand over to the live agent if there is none."""
+        code = as_feedback_code(feedback)
+        if self.off_tree:
+            self.live_agent.update(guess, code)
+            return
+        self.history.append((guess, code))
+        self.pool = None
+        child = self.tree.child(self.node, code)
+        if child is None:
+            self._leave_tree()
+        else:
+            self.node = child
+
+    @property
+    def candidates(self):
+        """The remaining candidate words, only filtered when asked for."""
+        if self.off_tree:
+            return self.live_agent.candidates
+        if self.pool is None:
+            self.pool = self.full_pool()
+            for guess, code in self.history:
+                self.filter_pool(guess, code)
+        return self.pool.words()
+
+    def add_candidate(self, word):
+        # The tree was recorded for the word list as it is on disk.
+        if not self.off_tree:
+            self._leave_tree()
+        self.live_agent.add_candidate(word)
+
+    def get_state(self):
+        live_state = self.live_agent.get_state() if self.off_tree else None
+        return self.node, list(self.history), list(self.previous_guesses), self.off_tree, live_state
+
+    def set_state(self, state):
+        node, history, previous_guesses, off_tree, live_state = state
+        self.node = node
+        self.history = list(history)
+        self.previous_guesses = list(previous_guesses)
+        self.pool = None
+        self.off_tree = off_tree
+        if off_tree:
+            self.live_agent.set_state(live_state)
+
+    def _leave_tree(self):
+        """Bring the live agent to the current position and let it play the rest of the game."""
+        if self.live_agent is None:
+            self.live_agent = POLICIES[self.policy](self.language)
+        self.live_agent.reset()
+        for guess, code in self.history:
+            self.live_agent.previous_guesses.append(guess)
+            self.live_agent.update(guess, code)
+        self.off_tree = True
+
+    def __str__(self):
+        return "Policy"
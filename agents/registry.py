@@ -0,0 +1,27 @@
+"""
+Agent Registry
+--------------
+Agent classes by name, imported only when first asked for.
+
+Importing an agent module pulls in NumPy, tqdm and the precomputed-artifact
+loaders, so code that only needs to list or name the agents (the start page)
+goes through get_agent_class() instead of importing them up front.
+"""
+
+from importlib import import_module
+
+# Agent name -> (module, class name)
+AGENT_CLASSES = {
+    "CSP": ("agents.CSP_agent", "CSP_agent"),
+    "Bayesian": ("agents.bayesian_agent", "BayesianAgent"),
+    "Frequency": ("agents.frequency_agent", "FrequencyAgent"),
+    "Entropy": ("agents.entropy_agent", "EntropyAgent"),
+}
+
+
+def get_agent_class(agent_name):
+    """Return the agent class registered under a name, importing its module on first use."""
+    if agent_name not in AGENT_CLASSES:
+        raise ValueError(f"Unknown agent: {agent_name}")
+    module_name, class_name = AGENT_CLASSES[agent_name]
+    return getattr(import_module(module_name), class_name)
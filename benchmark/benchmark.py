@@ -1,55 +1,48 @@
-import time
-from tqdm import tqdm
+import numpy as np
 
 from agents.frequency_agent import FrequencyAgent
-from env.wordle_env import WordleEnv
 from agents.CSP_agent import CSP_agent
 from agents.entropy_agent import EntropyAgent
 from agents.bayesian_agent import BayesianAgent
+from benchmark.runner import (MAX_GUESSES, make_games, make_exhaustive_games, run_games, latency_percentiles,
+                              print_latency_report, save_latency_samples)
 
 
-def benchmark(agents, n_games=100,language = "en", debug=False):
+def benchmark(agents, n_games=100,language = "en", debug=False, workers=1, seed=0, latency_file=None):
+    """
+    Play n_games games per agent and print the guesses per win, win rate and time per game.
+
+    Games are played through benchmark.runner like avg(): one reused agent per worker,
+    fixed secrets and seeds, per-move latencies. With debug, every game's outcome is printed.
+
+    Returns:
+        dict: Per agent name, (avg guesses per win, win rate, avg time per game).
+    """
     results = {}
+    games = make_games(1, n_games, language=language, seed=seed)
+    results_by_agent = {}
 
     for agent_class in agents:
         print(f"\nBenchmarking {agent_class.__name__}...\n")
-        total_guesses = 0
-        total_time = 0
-        wins = 0
-
-        for _ in tqdm(range(n_games), desc=f"{agent_class.__name__} Games"):
-
-            env = WordleEnv(language = language)
-            secret = env.reset()
-            agent = agent_class(language = language)
-            agent.reset()
-
-            start = time.time()
-            while not env.game_over:
-
-                guess = agent.get_guess()
-                feedback = env.guess(guess)
-                agent.update(guess, feedback)
+        game_results, construction_times = run_games(agent_class, games, language=language, workers=workers)
+        results_by_agent[agent_class.__name__] = game_results
 
-            if env.guesses[-1] == secret:
-                wins += 1
-                total_guesses += env.guess_count
+        if debug:
+            for result in game_results:
+                outcome = f"won in {result.guesses}" if result.won else f"lost after {result.guesses}"
+                print(f"  {result.secret}: {outcome} guesses")
 
-            if debug:
-                env.render()
-
-                
-
-            end = time.time()
-            total_time += (end - start)
-
-        avg_guesses = total_guesses / wins if wins > 0 else float('inf')
-        win_rate = (wins / n_games) * 100
-        avg_time = total_time / n_games
+        won = [result for result in game_results if result.won]
+        avg_guesses = sum(result.guesses for result in won) / len(won) if won else float('inf')
+        win_rate = (len(won) / n_games) * 100
+        avg_time = sum(result.time for result in game_results) / n_games
+        construction_time = sum(construction_times) / len(construction_times) if construction_times else 0.0
 
         results[agent_class.__name__] = (avg_guesses, win_rate, avg_time)
-        print(f"\n{agent_class.__name__}: Avg guesses per win: {avg_guesses:.2f}, Win rate: {win_rate:.1f}%, Avg time: {avg_time:.2f}s\n")
+        print(f"\n{agent_class.__name__}: Avg guesses per win: {avg_guesses:.2f}, Win rate: {win_rate:.1f}%, Avg time: {avg_time:.2f}s, "
+              f"Construction time: {construction_time:.2f}s\n")
 
+    _report_latencies(results_by_agent, latency_file)
     return results
 
 
@@ -58,69 +51,156 @@ def main(n_games = None,agents = None,language = "en" ):
     benchmark(agents, n_games=n_games or 100,language=language, debug=True)
 
 
-def avg(n_trials=1, n_games=100,agents = None,language = "en"):
+def avg(n_trials=1, n_games=100,agents = None,language = "en", workers=1, seed=0, latency_file=None):
+    """
+    Play n_trials x n_games games per agent and print the average of the per-trial averages.
+
+    Games are spread over `workers` processes (see benchmark.runner). Each game has a fixed
+    secret and seed derived from `seed`, so the results do not depend on the worker count.
+    Per-move latency percentiles are printed per agent; `latency_file` receives the raw
+    samples as CSV.
+    """
     agents = agents or [CSP_agent]
-    MAX_GUESSES = 6
 
     stats = {
         agent.__name__: {
             'guesses': 0.0,
             'win_rate': 0.0,
-            'time': 0.0
+            'time': 0.0,
+            'construction': 0.0
         } for agent in agents
     }
 
-    print(f"\nRunning {n_trials} benchmark trials per agent (each with {n_games} games)...\n")
+    print(f"\nRunning {n_trials} benchmark trials per agent (each with {n_games} games) on {workers} worker(s)...\n")
+
+    games = make_games(n_trials, n_games, language=language, seed=seed)
+    results_by_agent = {}
+    for agent_class in agents:
+        agent_name = agent_class.__name__
+        results, construction_times = run_games(agent_class, games, language=language, workers=workers)
+        results_by_agent[agent_name] = results
+        # Agents are built once per worker; their construction is not part of the per-game time.
+        stats[agent_name]['construction'] = sum(construction_times) / len(construction_times) if construction_times else 0.0
 
-    with tqdm(total=n_trials, desc="Overall Trials",position=0) as trial_bar:
         for trial in range(n_trials):
-            for agent_class in agents:
-                agent_name = agent_class.__name__
-                # Nested bar for the games of the current trial
-            
-                game_bar = tqdm(total=n_games, desc=f"{agent_name} Trial {trial + 1}", position = 2,leave=False)
-
-                total_guesses = 0
-                total_time = 0
-                wins = 0
-
-                for _ in range(n_games):
-                    
-                    env = WordleEnv(language = language)
-                    secret = env.reset()
-                    agent = agent_class(language = language)
-                    agent.reset()
-                    start = time.time()
-                    while not env.game_over:
-                        guess = agent.get_guess()
-                        feedback = env.guess(guess)
-                        agent.update(guess, feedback)
-
-                    if env.guesses[-1] == secret:
-                        wins += 1
-                        total_guesses += env.guess_count
-
-                    end = time.time()
-                    total_time += (end - start)
-                    game_bar.update(1)
-
-                game_bar.close()
-
-                avg_guesses = total_guesses / wins if wins > 0 else float('inf')
-                win_rate = (wins / n_games) * 100
-                avg_time = total_time / n_games
-
-                safe_guesses = avg_guesses if avg_guesses != float('inf') else MAX_GUESSES
-                stats[agent_name]['guesses'] += safe_guesses
-                stats[agent_name]['win_rate'] += win_rate
-                stats[agent_name]['time'] += avg_time
-
-            trial_bar.update(1)
+            trial_results = results[trial * n_games:(trial + 1) * n_games]
+            wins = sum(1 for result in trial_results if result.won)
+            total_guesses = sum(result.guesses for result in trial_results if result.won)
+            total_time = sum(result.time for result in trial_results)
+
+            avg_guesses = total_guesses / wins if wins > 0 else float('inf')
+            win_rate = (wins / n_games) * 100
+            avg_time = total_time / n_games
+
+            safe_guesses = avg_guesses if avg_guesses != float('inf') else MAX_GUESSES
+            stats[agent_name]['guesses'] += safe_guesses
+            stats[agent_name]['win_rate'] += win_rate
+            stats[agent_name]['time'] += avg_time
 
     print("\n=== Average of Averages ===")
     for agent_name, values in stats.items():
         avg_guesses = values['guesses'] / n_trials
         avg_winrate = values['win_rate'] / n_trials
         avg_time = values['time'] / n_trials
-        print(f"{agent_name}: Avg of Avg Guesses = {avg_guesses:.2f}, Avg Win Rate = {avg_winrate:.2f}%, Avg Time = {avg_time:.2f}s")
-    print()
\ No newline at end of file
+        print(f"{agent_name}: Avg of Avg Guesses = {avg_guesses:.2f}, Avg Win Rate = {avg_winrate:.2f}%, Avg Time = {avg_time:.2f}s, "
+              f"Construction Time = {values['construction']:.2f}s")
+    print()
+    _report_latencies(results_by_agent, latency_file)
+    return stats
+
+
+def exhaustive(agents=None, language="en", workers=1, seed=0, latency_file=None):
+    """
+    Play every word of the language's answer list exactly once per agent.
+
+    Unlike avg(), nothing is sampled: the numbers are exact for the answer list (and, for
+    agents that use random tie-breaks, for the given seed).
+
+    Returns:
+        dict: Per agent name, the win rate, mean guesses per win, the distribution of
+        guesses over won games, the failed secrets, the mean time per game, the agent
+        construction time and the per-move latency percentiles (see avg() for latency_file).
+    """
+    agents = agents or [CSP_agent]
+    games = make_exhaustive_games(language=language, seed=seed)
+    print(f"\nPlaying all {len(games)} answers per agent on {workers} worker(s)...\n")
+
+    report = {}
+    results_by_agent = {}
+    for agent_class in agents:
+        agent_name = agent_class.__name__
+        results, construction_times = run_games(agent_class, games, language=language, workers=workers)
+        results_by_agent[agent_name] = results
+        won = [result for result in results if result.won]
+        distribution = {}
+        for result in won:
+            distribution[result.guesses] = distribution.get(result.guesses, 0) + 1
+        report[agent_name] = {
+            'win_rate': len(won) / len(results) * 100,
+            'guesses': sum(result.guesses for result in won) / len(won) if won else float('inf'),
+            'distribution': dict(sorted(distribution.items())),
+            'failed': [result.secret for result in results if not result.won],
+            'time': sum(result.time for result in results) / len(results),
+            'construction': sum(construction_times) / len(construction_times) if construction_times else 0.0,
+            'latency': latency_percentiles(results),
+        }
+
+    print("\n=== Exhaustive Evaluation ===")
+    for agent_name, values in report.items():
+        print(f"{agent_name}: Win Rate = {values['win_rate']:.2f}% ({len(games) - len(values['failed'])}/{len(games)}), "
+              f"Avg Guesses = {values['guesses']:.3f}, Avg Time = {values['time']:.3f}s, "
+              f"Construction Time = {values['construction']:.3f}s")
+        print("  Guesses: " + ", ".join(f"{guesses}: {count}" for guesses, count in values['distribution'].items()))
+        if values['failed']:
+            print(f"  Failed ({len(values['failed'])}): {' '.join(values['failed'])}")
+    print()
+    _report_latencies(results_by_agent, latency_file)
+    return report
+
+
+def _report_latencies(results_by_agent, latency_file=None):
+    for agent_name, results in results_by_agent.items():
+        print_latency_report(agent_name, latency_percentiles(results))
+    print()
+    if latency_file:
+        save_latency_samples(latency_file, results_by_agent)
+        print(f"Raw latency samples written to {latency_file}\n")
+
+
+def sweep(agent_class, parameter, values, n_trials=1, n_games=100, language="en", workers=1, seed=0, **agent_kwargs):
+    """
+    Play the same games with an agent for each value of one constructor parameter.
+
+    For example, the accuracy a BayesianAgent gives up for a bounded beam:
+
+        sweep(BayesianAgent, "beam", [None, 1000, 300, 100, 30], log_space=True)
+
+    Returns:
+        dict: Per value, the win rate, mean guesses per win, mean time per game and the
+        p50/p99 of update() over all turns, in µs.
+    """
+    games = make_games(n_trials, n_games, language=language, seed=seed)
+    print(f"\nPlaying {len(games)} games per {parameter} value with {agent_class.__name__} on {workers} worker(s)...\n")
+
+    report = {}
+    for value in values:
+        kwargs = dict(agent_kwargs, **{parameter: value})
+        results, _ = run_games(agent_class, games, language=language, workers=workers,
+                               desc=f"{parameter}={value}", agent_kwargs=kwargs)
+        won = [result for result in results if result.won]
+        updates = [update_ns for result in results for _, _, update_ns in result.latencies if update_ns is not None]
+        report[value] = {
+            'win_rate': len(won) / len(results) * 100,
+            'guesses': sum(result.guesses for result in won) / len(won) if won else float('inf'),
+            'time': sum(result.time for result in results) / len(results),
+            'update_p50': float(np.percentile(updates, 50)) / 1000 if updates else 0.0,
+            'update_p99': float(np.percentile(updates, 99)) / 1000 if updates else 0.0,
+        }
+
+    print(f"\n=== {agent_class.__name__}: {parameter} sweep ===")
+    print(f"{parameter:>10}{'win rate':>11}{'guesses':>10}{'time':>10}{'update p50':>14}{'update p99':>14}")
+    for value, stats in report.items():
+        print(f"{str(value):>10}{stats['win_rate']:>10.2f}%{stats['guesses']:>10.3f}{stats['time']:>9.4f}s"
+              f"{stats['update_p50']:>11.1f} µs{stats['update_p99']:>11.1f} µs")
+    print()
+    return report
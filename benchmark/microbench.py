@@ -0,0 +1,256 @@
+"""
+Microbenchmarks
+---------------
+Times the solver's hot paths on their own, for both languages, and compares
+them against a stored baseline:
+
+    feedback/scalar         compute_feedback_code over 5000 (guess, answer) pairs
+    feedback/vector         feedback_codes of 20 guesses, each against the whole corpus
+    update/<agent>          100 update() calls per agent, each from a full pool
+    entropy/pass            every word scored against the pool left after one guess
+    load/entropy_cache      memory-mapping and reading the binary entropy cache, 20 times
+    load/pattern_matrix     memory-mapping the matrix and reading every 64th row, 20 times
+
+Each metric is the fastest of REPEATS timed runs, after one untimed warm-up run: the
+fastest run is the one least disturbed by the rest of the machine.
+Inputs are drawn from a fixed seed and every run gets fresh (guess, secret) pairs,
+so the pattern table's mask cache does not turn updates into lookups.
+
+Usage:
+    python benchmark/microbench.py                  # run and compare against the baseline
+    python benchmark/microbench.py --save           # run and store the results as the baseline
+    python benchmark/microbench.py --threshold 0.1 --language en --filter update
+
+The exit status is 1 when a metric is slower than its baseline by more than the
+threshold (a fraction, default 0.25). Baselines depend on the machine, so the
+baseline file is not versioned.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from agents.registry import AGENT_CLASSES, get_agent_class
+from core.candidates import CandidateSet
+from core.corpus import get_corpus
+from core.entropy import EntropyEngine
+from core.entropy_cache import entropy_cache_path, load_entropy_cache
+from core.feedback import compute_feedback_code, feedback_codes
+from core.pattern_matrix import get_pattern_table, load_pattern_matrix, pattern_matrix_path
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "microbench_baseline.json")
+DEFAULT_THRESHOLD = 0.25
+REPEATS = 7
+SEED = 0
+
+FEEDBACK_PAIRS = 5000
+GUESSES_PER_RUN = 20
+UPDATES_PER_RUN = 100
+LOADS_PER_RUN = 20
+
+
+def _pairs(words, rng, n):
+    return [(rng.choice(words), rng.choice(words)) for _ in range(n)]
+
+
+# Each case takes (language, rng), does its setup and returns a function that performs
+# one run and returns the seconds spent on the part being measured.
+
+def feedback_scalar(language, rng):
+    words = get_corpus(language).words
+    runs = iter([_pairs(words, rng, FEEDBACK_PAIRS) for _ in range(REPEATS + 1)])
+
+    def run():
+        pairs = next(runs)
+        start = time.perf_counter()
+        for guess, answer in pairs:
+            compute_feedback_code(guess, answer)
+        return time.perf_counter() - start
+    return run
+
+
+def feedback_vector(language, rng):
+    corpus = get_corpus(language)
+    runs = iter([corpus.encode(rng.sample(corpus.words, GUESSES_PER_RUN)) for _ in range(REPEATS + 1)])
+
+    def run():
+        guesses = next(runs)
+        start = time.perf_counter()
+        for guess in guesses:
+            feedback_codes(guess, corpus.encoded)
+        return time.perf_counter() - start
+    return run
+
+
+def update_case(agent_name):
+    def case(language, rng):
+        agent = get_agent_class(agent_name)(language=language)
+        words = agent.word_list()
+        runs = iter([_pairs(words, rng, UPDATES_PER_RUN) for _ in range(REPEATS + 1)])
+
+        def run():
+            elapsed = 0.0
+            for guess, secret in next(runs):
+                agent.reset()
+                feedback = agent.patterns.code(guess, secret)
+                start = time.perf_counter()
+                agent.update(guess, feedback)
+                elapsed += time.perf_counter() - start
+            return elapsed
+        return run
+    return case
+
+
+def entropy_pass(language, rng):
+    patterns = get_pattern_table(language)
+    corpus = patterns.corpus
+    engine = EntropyEngine(patterns)
+    guess_ids = np.arange(len(corpus))
+    # The same pool every run, so the metric does not depend on which secret was drawn.
+    guess, secret = rng.choice(corpus.words), rng.choice(corpus.words)
+    pool = CandidateSet.full(corpus)
+    pool.intersect(patterns.mask(guess, patterns.code(guess, secret)))
+    candidate_ids = pool.ids()
+
+    def run():
+        start = time.perf_counter()
+        engine.entropies(guess_ids, candidate_ids)
+        return time.perf_counter() - start
+    return run
+
+
+def load_entropy_cache_case(language, rng):
+    corpus = get_corpus(language)
+    path = entropy_cache_path(language)
+
+    def run():
+        start = time.perf_counter()
+        for _ in range(LOADS_PER_RUN):
+            cache = load_entropy_cache(path, language, corpus.content_hash)
+            if cache is None:
+                raise RuntimeError(f"No entropy cache for language='{language}' at {path}")
+            float(cache.max())
+        return time.perf_counter() - start
+    return run
+
+
+def load_pattern_matrix_case(language, rng):
+    corpus = get_corpus(language)
+    path = pattern_matrix_path(language)
+
+    def run():
+        start = time.perf_counter()
+        for _ in range(LOADS_PER_RUN):
+            matrix = load_pattern_matrix(path, corpus.base_size, corpus.content_hash)
+            if matrix is None:
+                raise RuntimeError(f"No pattern matrix for language='{language}' at {path}")
+            int(matrix[::64].sum())
+        return time.perf_counter() - start
+    return run
+
+
+CASES = {
+    "feedback/scalar": feedback_scalar,
+    "feedback/vector": feedback_vector,
+    **{f"update/{name}": update_case(name) for name in AGENT_CLASSES},
+    "entropy/pass": entropy_pass,
+    "load/entropy_cache": load_entropy_cache_case,
+    "load/pattern_matrix": load_pattern_matrix_case,
+}
+
+
+def run_benchmarks(languages=("en", "ar"), name_filter=None):
+    """
+    Run every case (whose name contains name_filter, if given) for each language.
+
+    Returns:
+        dict: Seconds of the fastest run per metric, keyed "<language>:<case>".
+    """
+    results = {}
+    for language in languages:
+        for name, case in CASES.items():
+            key = f"{language}:{name}"
+            if name_filter and name_filter not in key:
+                continue
+            run = case(language, random.Random(f"{SEED}-{key}"))
+            run()
+            results[key] = min(run() for _ in range(REPEATS))
+            print(f"{key:<28}{results[key] * 1000:>12.3f} ms")
+    return results
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    baseline = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, indent=2)
+
+
+def load_baseline(path=BASELINE_PATH):
+    """Return the metrics of a saved baseline, or None if there is none."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Print each metric against its baseline.
+
+    Returns:
+        list: The metrics slower than their baseline by more than `threshold`.
+    """
+    regressions = []
+    print(f"\n{'metric':<28}{'baseline ms':>14}{'current ms':>14}{'change':>10}")
+    for key, seconds in results.items():
+        if key not in baseline:
+            print(f"{key:<28}{'-':>14}{seconds * 1000:>14.3f}{'new':>10}")
+            continue
+        change = seconds / baseline[key] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(f"{key:<28}{baseline[key] * 1000:>14.3f}{seconds * 1000:>14.3f}{change:>+10.1%}{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks of the solver's hot paths.")
+    parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file to compare against or save to")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction of the baseline (default: %(default)s)")
+    parser.add_argument("--language", choices=("en", "ar"), action="append",
+                        help="language to run (repeatable; default: both)")
+    parser.add_argument("--filter", help="only run metrics whose name contains this text")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(tuple(args.language or ("en", "ar")), args.filter)
+    if args.save:
+        save_baseline(results, args.baseline)
+        print(f"\nSaved baseline to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save to create one.")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\nNo metric regressed by more than {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""
+Benchmark Runner
+----------------
+Plays benchmark games across a process pool, reproducibly.
+
+Every game is described by (trial, game, secret, seed) before anything is
+played: the secret is drawn from the answer list with its own generator, and
+the game seed is fed to `random` before the agent plays, which fixes every
+random.choice an agent makes. Games are split into contiguous chunks, played
+by worker processes and put back in order, so the results (and every
+aggregate computed from them) do not depend on the number of workers.
+
+Each worker constructs an agent once and reuses it for all of its games,
+relying on reset() (see BaseAgent.reset); the construction time is reported
+on its own instead of being folded into the per-game time.
+
+A chunk's games are played in lockstep through a core.batch_env.BatchWordleEnv,
+which scores the guesses of all games in one call. The agent moves between
+games with get_state()/set_state(), and every game keeps its own `random`
+state, so each game is played exactly as if it were played alone.
+
+Every get_guess() and update() call is timed with perf_counter_ns and kept
+per turn, so reports can show tail latencies (p95/p99/max) per move rather
+than a mean per game.
+"""
+
+import csv
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from tqdm import tqdm
+
+from core.batch_env import BatchWordleEnv
+from core.corpus import get_corpus
+from data.config import get_word_list
+
+MAX_GUESSES = 6
+
+# time: seconds spent in the agent's reset(), get_guess() and update() for this game.
+# latencies: one (turn, get_guess ns, update ns or None) tuple per guess made.
+GameResult = namedtuple("GameResult", ["trial", "game", "secret", "won", "guesses", "time", "latencies"])
+
+LATENCY_PERCENTILES = (50, 95, 99)
+
+# Games played in lockstep per call of play_games() when there is no process pool.
+SERIAL_CHUNK_SIZE = 100
+
+
+def answer_list(language="en"):
+    """
+    Return the secrets games are played with: the English game words, or the Arabic word list.
+
+    Secrets the agents cannot guess (game words missing from the language's word list)
+    are left out.
+    """
+    words = get_word_list("en", "game") if language == "en" else get_word_list(language)
+    corpus = get_corpus(language)
+    answers = [word for word in words if word in corpus]
+    if len(answers) < len(words):
+        print(f"Leaving out {len(words) - len(answers)} answer words missing from the '{language}' word list.")
+    return answers
+
+
+def game_seed(seed, trial, game):
+    """Seed of one game, derived only from the run seed and the game's position."""
+    return (seed * 1_000_003 + trial) * 1_000_003 + game
+
+
+def make_games(n_trials, n_games, language="en", seed=0):
+    """
+    Describe n_trials x n_games games as (trial, game, secret, seed) tuples.
+    Every agent of a run plays the same games.
+    """
+    answers = answer_list(language)
+    games = []
+    for trial in range(n_trials):
+        for game in range(n_games):
+            s = game_seed(seed, trial, game)
+            secret = random.Random(f"secret-{s}").choice(answers)
+            games.append((trial, game, secret, s))
+    return games
+
+
+def make_exhaustive_games(language="en", seed=0):
+    """Describe one game per word of the answer list, in list order, as a single trial."""
+    return [(0, game, secret, game_seed(seed, 0, game)) for game, secret in enumerate(answer_list(language))]
+
+
+# Agents constructed in this process, by (agent class, language, constructor arguments).
+_agents = {}
+
+
+def get_agent(agent_class, language, agent_kwargs=None):
+    """
+    Return this process's agent of a class, language and constructor arguments,
+    constructing it on first use.
+
+    Returns:
+        tuple: (agent, seconds spent constructing it now; 0.0 if it already existed).
+    """
+    agent_kwargs = agent_kwargs or {}
+    key = (agent_class, language, tuple(sorted(agent_kwargs.items())))
+    if key in _agents:
+        return _agents[key], 0.0
+    start = time.perf_counter()
+    _agents[key] = agent_class(language=language, **agent_kwargs)
+    return _agents[key], time.perf_counter() - start
+
+
+def play_games(agent_class, language, games, agent_kwargs=None, max_guesses=MAX_GUESSES):
+    """
+    Play a list of games in lockstep in this process, with its (reused) agent.
+
+    Returns:
+        tuple: (list of GameResult, seconds spent constructing the agent for this call).
+    """
+    agent, construction_time = get_agent(agent_class, language, agent_kwargs)
+    env = BatchWordleEnv([secret for _, _, secret, _ in games], language=language, max_guesses=max_guesses)
+    times = [0.0] * len(games)
+    latencies = [[] for _ in games]
+    # Each game's agent state and random state, between its moves.
+    states = []
+    random_states = []
+    for i, (_, _, _, seed) in enumerate(games):
+        random.seed(seed)
+        start = time.perf_counter()
+        agent.reset()
+        times[i] += time.perf_counter() - start
+        states.append(agent.get_state())
+        random_states.append(random.getstate())
+
+    def resume(i):
+        agent.set_state(states[i])
+        random.setstate(random_states[i])
+
+    def suspend(i):
+        states[i] = agent.get_state()
+        random_states[i] = random.getstate()
+
+    while not env.done.all():
+        active = env.active
+        guesses = [None] * len(games)
+        guess_ns = {}
+        for i in active:
+            resume(i)
+            before_guess = time.perf_counter_ns()
+            guesses[i] = agent.get_guess()
+            guess_ns[i] = time.perf_counter_ns() - before_guess
+            times[i] += guess_ns[i] / 1e9
+            suspend(i)
+        codes, _ = env.step(guesses)
+        for i in active:
+            turn = int(env.guess_counts[i])
+            if guesses[i] is None:
+                continue
+            if env.won[i]:
+                latencies[i].append((turn, guess_ns[i], None))
+            else:
+                resume(i)
+                before_update = time.perf_counter_ns()
+                agent.update(guesses[i], int(codes[i]))
+                update_ns = time.perf_counter_ns() - before_update
+                times[i] += update_ns / 1e9
+                suspend(i)
+                latencies[i].append((turn, guess_ns[i], update_ns))
+
+    results = [GameResult(trial, game, secret, bool(env.won[i]), int(env.guess_counts[i]), times[i], latencies[i])
+               for i, (trial, game, secret, _) in enumerate(games)]
+    return results, construction_time
+
+
+def run_games(agent_class, games, language="en", workers=1, desc=None, agent_kwargs=None):
+    """
+    Play games with an agent, across `workers` processes.
+    The agent is constructed with `agent_kwargs` on top of the language.
+
+    Returns:
+        tuple: (one GameResult per game in the order of `games`,
+                list of construction times, one per agent constructed).
+    """
+    desc = desc or f"{agent_class.__name__} Games"
+    construction_times = []
+    if workers <= 1:
+        results = []
+        with tqdm(total=len(games), desc=desc, unit="game") as bar:
+            for chunk in _chunks(games, SERIAL_CHUNK_SIZE):
+                chunk_results, construction_time = play_games(agent_class, language, chunk, agent_kwargs)
+                results.extend(chunk_results)
+                if construction_time:
+                    construction_times.append(construction_time)
+                bar.update(len(chunk_results))
+        return results, construction_times
+
+    chunks = _chunks(games, max(1, len(games) // (workers * 8)))
+    results = [None] * len(chunks)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(play_games, agent_class, language, chunk, agent_kwargs): i for i, chunk in enumerate(chunks)}
+        with tqdm(total=len(games), desc=desc, unit="game") as bar:
+            for future in as_completed(futures):
+                chunk_results, construction_time = future.result()
+                results[futures[future]] = chunk_results
+                if construction_time:
+                    construction_times.append(construction_time)
+                bar.update(len(chunk_results))
+    return [result for chunk in results for result in chunk], construction_times
+
+
+def latency_percentiles(results):
+    """
+    Summarize per-move latencies by call and turn.
+
+    Returns:
+        dict: {(call, turn): {'count': n, 'p50': µs, 'p95': µs, 'p99': µs, 'max': µs}}
+        for call in ("get_guess", "update"), in turn order.
+    """
+    samples = {}
+    for result in results:
+        for turn, guess_ns, update_ns in result.latencies:
+            samples.setdefault(("get_guess", turn), []).append(guess_ns)
+            if update_ns is not None:
+                samples.setdefault(("update", turn), []).append(update_ns)
+
+    summary = {}
+    for key in sorted(samples):
+        values = np.array(samples[key]) / 1000
+        percentiles = np.percentile(values, LATENCY_PERCENTILES)
+        summary[key] = {'count': len(values)}
+        summary[key].update({f"p{p}": float(v) for p, v in zip(LATENCY_PERCENTILES, percentiles)})
+        summary[key]['max'] = float(values.max())
+    return summary
+
+
+def print_latency_report(agent_name, summary):
+    print(f"{agent_name} per-move latency (µs):")
+    print(f"  {'call':<10}{'turn':>5}{'count':>8}{'p50':>11}{'p95':>11}{'p99':>11}{'max':>11}")
+    for (call, turn), values in summary.items():
+        print(f"  {call:<10}{turn:>5}{values['count']:>8}{values['p50']:>11.1f}{values['p95']:>11.1f}"
+              f"{values['p99']:>11.1f}{values['max']:>11.1f}")
+
+
+def save_latency_samples(path, results_by_agent):
+    """
+    Write every timed call as a CSV row: agent, trial, game, secret, turn, call, ns.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["agent", "trial", "game", "secret", "turn", "call", "ns"])
+        for agent_name, results in results_by_agent.items():
+            for result in results:
+                for turn, guess_ns, update_ns in result.latencies:
+                    writer.writerow([agent_name, result.trial, result.game, result.secret, turn, "get_guess", guess_ns])
+                    if update_ns is not None:
+                        writer.writerow([agent_name, result.trial, result.game, result.secret, turn, "update", update_ns])
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
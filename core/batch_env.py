@@ -0,0 +1,76 @@
+"""
+Batch Environment
+-----------------
+K Wordle games played in lockstep, without Qt or the `env` package.
+
+The secrets are held as a (K, 5) array of letter ids (see Corpus.encode).
+Each step takes one guess per game and scores all of them with a single
+call to the vectorized feedback kernel, instead of K calls to a one-game
+environment. Games that are over ignore their guess.
+"""
+
+import numpy as np
+
+from core.corpus import get_corpus
+from core.feedback import ALL_GREEN, feedback_codes
+
+MAX_GUESSES = 6
+
+
+class BatchWordleEnv:
+    def __init__(self, secrets, language="en", max_guesses=MAX_GUESSES):
+        """
+        Args:
+            secrets (list): One secret word per game.
+            language (str): "en" or "ar"; its corpus supplies the letter encoding.
+            max_guesses (int): Guesses allowed per game.
+        """
+        self.corpus = get_corpus(language)
+        self.secrets = list(secrets)
+        self.encoded = self.corpus.encode(self.secrets)
+        self.max_guesses = max_guesses
+        self.reset()
+
+    def __len__(self):
+        return len(self.secrets)
+
+    def reset(self):
+        """Start every game over with the same secrets."""
+        self.guess_counts = np.zeros(len(self), dtype=np.int64)
+        self.won = np.zeros(len(self), dtype=bool)
+        self.done = np.zeros(len(self), dtype=bool)
+
+    @property
+    def active(self):
+        """Indices of the games still in progress."""
+        return np.flatnonzero(~self.done)
+
+    def step(self, guesses):
+        """
+        Play one guess in every game still in progress.
+
+        Args:
+            guesses (list): One guess per game. Entries of finished games are ignored and may
+                be None; None in a game still in progress (the agent has nothing left to guess)
+                ends that game as lost.
+
+        Returns:
+            tuple: (np.ndarray of uint8 feedback codes, np.ndarray of bool done flags), one
+            per game. The code of a game that was already over is 0.
+        """
+        if len(guesses) != len(self):
+            raise ValueError(f"Expected {len(self)} guesses, got {len(guesses)}")
+        playing = ~self.done
+        gave_up = playing & np.array([guess is None for guess in guesses], dtype=bool)
+        playing &= ~gave_up
+        self.done |= gave_up
+
+        codes = np.zeros(len(self), dtype=np.uint8)
+        ids = np.flatnonzero(playing)
+        if len(ids):
+            encoded_guesses = self.corpus.encode([guesses[i] for i in ids])
+            codes[ids] = feedback_codes(encoded_guesses, self.encoded[ids])
+            self.guess_counts[ids] += 1
+            self.won[ids] = codes[ids] == ALL_GREEN
+            self.done[ids] = self.won[ids] | (self.guess_counts[ids] >= self.max_guesses)
+        return codes, self.done.copy()
@@ -0,0 +1,86 @@
+"""
+Candidate Set
+-------------
+A pool of candidate words stored as a boolean mask over a corpus.
+
+Filtering a pool after a guess is a single AND with the cached
+(guess, pattern) mask from the PatternTable, and counting or emptiness
+checks are popcounts, instead of rebuilding Python lists word by word.
+"""
+
+import numpy as np
+
+
+class CandidateSet:
+    def __init__(self, corpus, mask):
+        """
+        Args:
+            corpus (Corpus): The corpus the mask is indexed by.
+            mask (np.ndarray): One bool per corpus word; True means the word is a candidate.
+        """
+        self.corpus = corpus
+        self.mask = mask
+        self._words = None
+
+    @classmethod
+    def full(cls, corpus):
+        """Return a set containing every word of the corpus."""
+        return cls(corpus, np.ones(len(corpus), dtype=bool))
+
+    def copy(self):
+        return CandidateSet(self.corpus, self.mask.copy())
+
+    def __len__(self):
+        return int(np.count_nonzero(self.mask))
+
+    def __bool__(self):
+        return bool(self.mask.any())
+
+    def __contains__(self, word):
+        i = self.corpus.id_of(word)
+        return i is not None and i < len(self.mask) and bool(self.mask[i])
+
+    def is_full(self):
+        """True if every corpus word (including words added at runtime) is a candidate."""
+        return len(self.mask) == len(self.corpus) and bool(self.mask.all())
+
+    def ids(self):
+        """Return the corpus indices of the candidates, in corpus order."""
+        return np.flatnonzero(self.mask)
+
+    def words(self):
+        """Return the candidate words, in corpus order."""
+        if self._words is None:
+            words = self.corpus.words
+            self._words = [words[i] for i in self.ids()]
+        return self._words
+
+    def intersect(self, mask):
+        """Keep only the candidates that are also set in `mask` (a mask over the corpus)."""
+        self._fit()
+        self.mask &= mask
+        self._words = None
+
+    def set_mask(self, mask):
+        """Replace the candidates with the words set in `mask`."""
+        self.mask = mask
+        self._words = None
+
+    def add(self, word):
+        """Add a corpus word to the candidates."""
+        self._fit()
+        self.mask[self.corpus.id_of(word)] = True
+        self._words = None
+
+    def discard(self, word):
+        """Remove a word from the candidates if it is one."""
+        i = self.corpus.id_of(word)
+        if i is not None and i < len(self.mask) and self.mask[i]:
+            self.mask[i] = False
+            self._words = None
+
+    def _fit(self):
+        # The corpus may have grown (words added at runtime) since this mask was made.
+        missing = len(self.corpus) - len(self.mask)
+        if missing > 0:
+            self.mask = np.concatenate([self.mask, np.zeros(missing, dtype=bool)])
@@ -0,0 +1,132 @@
+"""
+Constraints
+-----------
+Feedback compiled into per-letter constraints, checked against the corpus's
+inverted indexes instead of recomputing feedback for every candidate.
+
+Under the two-pass rule of core.feedback, a word gets feedback `code` for a
+guess exactly when:
+
+    green at i                 the word has the guessed letter at i
+    yellow or grey at i        the word does not have the guessed letter at i
+    letter L, no grey          the word has at least (greens + yellows of L) copies of L
+    letter L, some grey        the word has exactly (greens + yellows of L) copies of L
+
+and, for every letter, the yellows of its non-green positions come before its
+greys (yellows are handed out left to right, so any other order is a code no
+word can produce).
+
+Filtering starts from the index entry of the most selective constraint and
+checks the others only on the words still left.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from core.feedback import FEEDBACK_DIGITS, GREEN, GREY
+
+# kind: "at" (letter at position), "not_at", "at_least" (count copies of letter) or "at_most".
+Constraint = namedtuple("Constraint", ["kind", "letter", "position", "count"])
+
+
+def compile_feedback(corpus, guess, code):
+    """
+    Turn the feedback of a guess into constraints on the secret.
+
+    Args:
+        corpus (Corpus): Supplies the letter ids.
+        guess (str): The guessed word.
+        code (int): The feedback code.
+
+    Returns:
+        list: Constraints that hold exactly for the words giving `code`, or None if
+        no word can give it.
+    """
+    letters = corpus.encode_word(guess).tolist()
+    digits = FEEDBACK_DIGITS[code].tolist()
+    constraints = []
+    found = {}
+    greyed = set()
+    for i, (letter, digit) in enumerate(zip(letters, digits)):
+        if digit == GREEN:
+            constraints.append(Constraint("at", letter, i, None))
+        else:
+            constraints.append(Constraint("not_at", letter, i, None))
+            if digit == GREY:
+                greyed.add(letter)
+            elif letter in greyed:
+                # A yellow after a grey of the same letter.
+                return None
+        if digit != GREY:
+            found[letter] = found.get(letter, 0) + 1
+    for letter in dict.fromkeys(letters):
+        count = found.get(letter, 0)
+        if count:
+            constraints.append(Constraint("at_least", letter, None, count))
+        if letter in greyed:
+            constraints.append(Constraint("at_most", letter, None, count))
+    return constraints
+
+
+def filter_ids(corpus, ids, constraints):
+    """
+    Return the ids (ascending) among `ids` of the words satisfying every constraint.
+
+    Args:
+        corpus (Corpus): The corpus and its indexes.
+        ids (np.ndarray): Ascending corpus ids to filter (e.g. CandidateSet.ids()).
+        constraints (list): Constraints from compile_feedback(), or None (no word matches).
+    """
+    if constraints is None:
+        return ids[:0]
+    constraints = sorted(constraints, key=lambda constraint: matching_count(corpus, constraint))
+    first = constraints[0]
+    if first.kind in ("at", "at_least") and matching_count(corpus, first) < len(ids):
+        # Start from the index entry: only words satisfying the first constraint are looked at.
+        members = np.zeros(len(corpus), dtype=bool)
+        members[ids] = True
+        start = _index_ids(corpus, first)
+        ids = start[members[start]]
+    else:
+        ids = ids[_matches(corpus, ids, first)]
+    for constraint in constraints[1:]:
+        if not len(ids):
+            break
+        ids = ids[_matches(corpus, ids, constraint)]
+    return ids
+
+
+def matching_count(corpus, constraint):
+    """Return how many corpus words satisfy a constraint, from the index sizes."""
+    size = len(_index_ids(corpus, constraint))
+    if constraint.kind in ("at", "at_least"):
+        return size
+    return len(corpus) - size
+
+
+def _index_ids(corpus, constraint):
+    # The index entry a constraint is (the complement of) one of.
+    if constraint.kind in ("at", "not_at"):
+        entries = corpus.position_index[constraint.position]
+        return entries[constraint.letter] if constraint.letter < len(entries) else _NO_IDS
+    count = constraint.count if constraint.kind == "at_least" else constraint.count + 1
+    entries = corpus.letter_index[constraint.letter] if constraint.letter < len(corpus.letter_index) else []
+    return entries[count] if count < len(entries) else _NO_IDS
+
+
+def _matches(corpus, ids, constraint):
+    # One bool per id: does the word satisfy the constraint?
+    if constraint.kind in ("at", "not_at"):
+        at = corpus.encoded[ids, constraint.position] == constraint.letter
+        return at if constraint.kind == "at" else ~at
+    if constraint.letter < corpus.letter_counts.shape[1]:
+        counts = corpus.letter_counts[ids, constraint.letter]
+    else:
+        counts = np.zeros(len(ids), dtype=np.uint8)
+    if constraint.kind == "at_least":
+        return counts >= constraint.count
+    return counts <= constraint.count
+
+
+_NO_IDS = np.zeros(0, dtype=np.int64)
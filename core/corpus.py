@@ -0,0 +1,148 @@
+"""
+Corpus
+------
+A language's word list together with a word -> index mapping.
+
+Precomputed artifacts (such as the pattern matrix) are indexed by a word's
+position in this list, so every agent of a language shares one Corpus.
+Each word is also encoded as 5 small letter ids, the representation the
+vectorized feedback kernel works on, and counted as a word x alphabet matrix
+of letter counts, so letter statistics over a candidate pool are column sums.
+Inverted indexes (position -> letter -> word ids, letter -> minimum count ->
+word ids) let feedback be checked as constraints, see core.constraints.
+"""
+
+import hashlib
+
+import numpy as np
+
+from data.config import get_word_list
+
+
+class Corpus:
+    def __init__(self, language, words):
+        """
+        Args:
+            language (str): "en" or "ar".
+            words (list): The language's full word list, in file order.
+        """
+        self.language = language
+        self.words = list(words)
+        self.index = {word: i for i, word in enumerate(self.words)}
+        # Number of words read from the word list file; words past it were added at runtime
+        # and have no rows in precomputed artifacts.
+        self.base_size = len(self.words)
+        # Identifies the word list on disk; derived artifacts record it to detect staleness.
+        self.content_hash = word_list_hash(self.words)
+        self.alphabet = {}
+        for letter in sorted(set("".join(self.words))):
+            self.alphabet[letter] = len(self.alphabet)
+        self.encoded = self._encode_new(self.words)
+        # letter_counts[i, a] is how often letter id a occurs in word i; presence is letter_counts > 0.
+        self.letter_counts = _letter_counts(self.encoded, len(self.alphabet))
+        self.presence = self.letter_counts > 0
+        self._build_indexes()
+
+    def __len__(self):
+        return len(self.words)
+
+    def __contains__(self, word):
+        return word in self.index
+
+    def id_of(self, word):
+        """Return the index of a word, or None if it is not part of the corpus."""
+        return self.index.get(word)
+
+    def add_word(self, word):
+        """
+        Append a word accepted at runtime (e.g. a validated word typed in the UI).
+
+        Returns:
+            int: The word's index, existing or new.
+        """
+        if word in self.index:
+            return self.index[word]
+        self.index[word] = len(self.words)
+        self.words.append(word)
+        self.encoded = np.vstack([self.encoded, self._encode_new([word])])
+        self.letter_counts = _letter_counts(self.encoded, len(self.alphabet))
+        self.presence = self.letter_counts > 0
+        self._build_indexes()
+        return self.index[word]
+
+    def encode(self, words):
+        """
+        Encode a list of words as a (len(words), 5) uint8 array of letter ids.
+        Corpus words reuse their precomputed rows; other words are encoded on the fly.
+        """
+        ids = [self.index.get(word) for word in words]
+        if None not in ids:
+            return self.encoded[ids]
+        return self._encode_new(words)
+
+    def encode_word(self, word):
+        """Encode a single word as a (5,) uint8 array of letter ids."""
+        return self.encode([word])[0]
+
+    def letter_frequencies(self, ids):
+        """
+        Return how often each letter id occurs over the given words, counting repeated letters.
+        """
+        return self.letter_counts[ids].sum(axis=0, dtype=np.int64)
+
+    def positional_counts(self, ids):
+        """
+        Return a (5, alphabet size) array: how many of the given words have each letter at each position.
+        The alphabet size is that of letter_counts, so both agree on the number of letter ids.
+        """
+        encoded = self.encoded[ids]
+        return np.stack([np.bincount(encoded[:, i], minlength=self.letter_counts.shape[1])
+                         for i in range(encoded.shape[1])])
+
+    def _build_indexes(self):
+        # position_index[i][a]: ascending ids of the words with letter id a at position i.
+        # letter_index[a][k]: ascending ids of the words with at least k copies of letter id a.
+        size = self.letter_counts.shape[1]
+        self.position_index = [_group_ids(self.encoded[:, i], size) for i in range(self.encoded.shape[1])]
+        self.letter_index = [[np.flatnonzero(self.letter_counts[:, a] >= k) for k in range(self.encoded.shape[1] + 1)]
+                             for a in range(size)]
+
+    def _encode_new(self, words):
+        # Letters outside the corpus alphabet (words added at runtime) get fresh ids.
+        for letter in "".join(words):
+            if letter not in self.alphabet:
+                self.alphabet[letter] = len(self.alphabet)
+        encoded = np.array([[self.alphabet[letter] for letter in word] for word in words], dtype=np.uint8)
+        return encoded.reshape(len(words), -1)
+
+
+def _letter_counts(encoded, alphabet_size):
+    counts = np.zeros((len(encoded), alphabet_size), dtype=np.uint8)
+    rows = np.arange(len(encoded))
+    for i in range(encoded.shape[1]):
+        np.add.at(counts, (rows, encoded[:, i]), 1)
+    return counts
+
+
+def _group_ids(values, size):
+    # For each value below size, the ascending positions holding it.
+    order = np.argsort(values, kind="stable")
+    bounds = np.cumsum(np.bincount(values, minlength=size))
+    return np.split(order, bounds[:-1])
+
+
+def word_list_hash(words):
+    """Return the SHA-256 hex digest of a word list (order matters: artifacts are indexed by it)."""
+    return hashlib.sha256("\n".join(words).encode("utf-8")).hexdigest()
+
+
+_corpora = {}
+
+
+def get_corpus(language="en"):
+    """Return the shared Corpus for a language, building it on first use."""
+    if language not in _corpora:
+        if language not in ("en", "ar"):
+            raise ValueError(f"Unsupported language: {language}")
+        _corpora[language] = Corpus(language, get_word_list(language))
+    return _corpora[language]
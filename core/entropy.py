@@ -0,0 +1,240 @@
+"""
+Entropy Engine
+--------------
+Vectorized expected-information scoring of guesses over a candidate pool.
+
+For a block of guesses at once, the feedback codes against every candidate
+are histogrammed into 243 pattern buckets with a single bincount. With C
+candidates and bucket counts c_k, the entropy of a guess is
+
+    H = log2(C) - sum(c_k * log2(c_k)) / C
+
+so the only per-bucket work is a lookup in a precomputed n*log2(n) table.
+The bucket counts themselves (pattern_counts(), pattern_histograms()) are
+what the entropy cache stores to be rebuilt incrementally.
+
+That formula rounds differently from summing -p*log2(p) bucket by bucket,
+so guesses whose entropies differ only by floating-point noise could swap
+places. best_guess() therefore re-scores the few guesses within TIE_TOLERANCE
+of the maximum with reference_entropy(), the agents' original loop, and
+picks the winner the way max() over the word list always has.
+
+Scoring is independent per guess, so the guess pool can be sharded across
+workers: threads (the heavy array calls release the GIL) or processes that
+each memory-map the same read-only pattern matrix. Shards are contiguous
+and concatenated in order, so the result is identical to a serial run.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from core.feedback import NUM_PATTERNS, feedback_codes
+from core.pattern_matrix import get_pattern_table
+
+BACKENDS = ("thread", "process")
+
+
+def nlogn_table(n):
+    """Return t with t[k] = k * log2(k) for k = 0..n (t[0] = 0)."""
+    table = np.zeros(n + 1)
+    k = np.arange(1, n + 1)
+    table[1:] = k * np.log2(k)
+    return table
+
+
+def reference_entropy(codes):
+    """
+    Entropy of a list of feedback codes, summed bucket by bucket in order of first appearance.
+    """
+    feedback_counts = {}
+    for fb in codes:
+        feedback_counts[fb] = feedback_counts.get(fb, 0) + 1
+    total = len(codes)
+    entropy = 0.0
+    for count in feedback_counts.values():
+        p = count / total
+        entropy -= p * math.log2(p)
+    return entropy
+
+
+def entropies_from_counts(counts):
+    """
+    Entropy of each row of a (guesses, 243) array of pattern bucket counts.
+
+    Every row must count the same candidates, e.g. the output of pattern_histograms().
+    """
+    counts = np.asarray(counts)
+    total = int(counts[0].sum()) if len(counts) else 0
+    if total == 0:
+        return np.zeros(len(counts))
+    return np.log2(total) - nlogn_table(total)[counts].sum(axis=1) / total
+
+
+def pattern_histograms(guesses, answers, block_pairs=1 << 21):
+    """
+    Count, for each guess, how many answers give each of the 243 feedback codes.
+
+    Works on letter-encoded words with the feedback kernel, so the words need not
+    belong to a corpus or be covered by a pattern matrix.
+
+    Args:
+        guesses (np.ndarray): Encoded guesses, shape (G, 5).
+        answers (np.ndarray): Encoded answers, shape (A, 5).
+
+    Returns:
+        np.ndarray: A (G, 243) int64 array of counts.
+    """
+    counts = np.zeros((len(guesses), NUM_PATTERNS), dtype=np.int64)
+    if len(answers) == 0:
+        return counts
+    block_size = max(1, block_pairs // len(answers))
+    for start in range(0, len(guesses), block_size):
+        block = guesses[start:start + block_size]
+        codes = feedback_codes(block[:, None, :], answers[None, :, :])
+        counts[start:start + len(block)] = _bucket_counts(codes)
+    return counts
+
+
+def _bucket_counts(codes):
+    # Shift each guess's codes into its own range of 243 buckets and count them all at once.
+    offsets = np.arange(len(codes), dtype=np.intp)[:, None] * NUM_PATTERNS
+    counts = np.bincount((codes + offsets).ravel(), minlength=len(codes) * NUM_PATTERNS)
+    return counts.reshape(len(codes), NUM_PATTERNS)
+
+
+class EntropyEngine:
+    # Target number of (guess, candidate) pairs handled per block.
+    BLOCK_PAIRS = 1 << 21
+    # Vectorized entropies this close to the maximum are re-scored with reference_entropy().
+    TIE_TOLERANCE = 1e-9
+    # Below this many (guess, candidate) pairs the work is not worth sharding.
+    PARALLEL_MIN_PAIRS = 1 << 20
+
+    def __init__(self, patterns, workers=1, backend="thread"):
+        """
+        Args:
+            patterns (PatternTable): Feedback lookups for the language.
+            workers (int): Number of workers to shard the guess pool across; 1 runs serially.
+            backend (str): "thread" or "process".
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unsupported backend: {backend}")
+        self.patterns = patterns
+        self.workers = workers
+        self.backend = backend
+        self._nlogn = nlogn_table(0)
+        self._executor = None
+
+    def close(self):
+        """Shut down the worker pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.backend == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                                     initargs=(self.patterns.corpus.language,))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def entropies(self, guess_ids, candidate_ids):
+        """
+        Compute the entropy of each guess over the candidate pool.
+
+        Args:
+            guess_ids (np.ndarray): Corpus indices of the guesses to score.
+            candidate_ids (np.ndarray): Corpus indices of the remaining candidates.
+
+        Returns:
+            np.ndarray: One entropy (in bits) per guess, in guess_ids order.
+        """
+        guess_ids = np.asarray(guess_ids)
+        candidate_ids = np.asarray(candidate_ids)
+        total = len(candidate_ids)
+        if total == 0:
+            return np.zeros(len(guess_ids))
+        if len(self._nlogn) <= total:
+            self._nlogn = nlogn_table(total)
+
+        if self.workers > 1 and len(guess_ids) * total >= self.PARALLEL_MIN_PAIRS:
+            return self._parallel_entropies(guess_ids, candidate_ids)
+        return self._serial_entropies(guess_ids, candidate_ids)
+
+    def _parallel_entropies(self, guess_ids, candidate_ids):
+        corpus = self.patterns.corpus
+        if self.backend == "process" and len(corpus) > corpus.base_size:
+            # Words added at runtime only exist in this process; score them here.
+            return self._serial_entropies(guess_ids, candidate_ids)
+
+        executor = self._get_executor()
+        shards = np.array_split(guess_ids, self.workers)
+        if self.backend == "process":
+            futures = [executor.submit(_worker_entropies, shard, candidate_ids) for shard in shards]
+        else:
+            futures = [executor.submit(self._serial_entropies, shard, candidate_ids) for shard in shards]
+        return np.concatenate([future.result() for future in futures])
+
+    def _serial_entropies(self, guess_ids, candidate_ids):
+        total = len(candidate_ids)
+        if len(self._nlogn) <= total:
+            self._nlogn = nlogn_table(total)
+        result = np.zeros(len(guess_ids))
+        block_size = max(1, self.BLOCK_PAIRS // total)
+        for start in range(0, len(guess_ids), block_size):
+            block = guess_ids[start:start + block_size]
+            result[start:start + len(block)] = self._block_entropies(block, candidate_ids)
+        return result
+
+    def best_guess(self, guess_ids, candidate_ids):
+        """
+        Return the corpus index of the guess with the highest entropy over the candidates.
+
+        Ties are resolved exactly as max() over guess_ids with reference_entropy() as key.
+        """
+        guess_ids = np.asarray(guess_ids)
+        entropies = self.entropies(guess_ids, candidate_ids)
+        near = np.flatnonzero(entropies >= entropies.max() - self.TIE_TOLERANCE)
+        if len(near) == 1:
+            return int(guess_ids[near[0]])
+        contenders = guess_ids[near]
+        codes = self.patterns.block(contenders, candidate_ids).tolist()
+        best = max(range(len(contenders)), key=lambda i: reference_entropy(codes[i]))
+        return int(contenders[best])
+
+    def pattern_counts(self, guess_ids, candidate_ids):
+        """
+        Return the (len(guess_ids), 243) counts of candidates per feedback code for each guess.
+        """
+        guess_ids = np.asarray(guess_ids)
+        candidate_ids = np.asarray(candidate_ids)
+        counts = np.zeros((len(guess_ids), NUM_PATTERNS), dtype=np.int64)
+        if len(candidate_ids) == 0:
+            return counts
+        block_size = max(1, self.BLOCK_PAIRS // len(candidate_ids))
+        for start in range(0, len(guess_ids), block_size):
+            block = guess_ids[start:start + block_size]
+            counts[start:start + len(block)] = _bucket_counts(self.patterns.block(block, candidate_ids))
+        return counts
+
+    def _block_entropies(self, guess_ids, candidate_ids):
+        total = len(candidate_ids)
+        counts = _bucket_counts(self.patterns.block(guess_ids, candidate_ids))
+        return np.log2(total) - self._nlogn[counts].sum(axis=1) / total
+
+
+# Per-process engine used by the "process" backend.
+_worker_engine = None
+
+
+def _init_worker(language):
+    global _worker_engine
+    _worker_engine = EntropyEngine(get_pattern_table(language))
+
+
+def _worker_entropies(guess_ids, candidate_ids):
+    return _worker_engine._serial_entropies(guess_ids, candidate_ids)
@@ -0,0 +1,246 @@
+"""
+Entropy Cache
+-------------
+The entropy of every word as a first guess, stored in a small binary file.
+
+The file is a fixed 64-byte header followed by one float32 per word, in
+word-list order, so loading it is a memory map with nothing to parse:
+
+    magic       4 bytes   b"WENT"
+    version     uint16
+    language    2 bytes   "en" / "ar"
+    count       uint32    number of words
+    hash        32 bytes  SHA-256 of the word list (see core.corpus.word_list_hash)
+    (padding up to 64 bytes)
+    entropies   count x float32 (little-endian)
+
+The JSON caches of earlier versions (word -> entropy) can still be imported
+with import_json_entropy_cache() when they cover exactly the current word list.
+
+Next to the cache, an .npz file keeps the word list it was built from and
+each word's 243 pattern bucket counts over that list. When words are added
+to (or removed from) the list, build_entropy_cache() only scores the new
+words in full and adjusts the other rows by the answers that came and went,
+instead of redoing the whole N x N pass.
+"""
+
+import json
+import os
+import struct
+import tempfile
+import zipfile
+
+import numpy as np
+
+from core.corpus import word_list_hash
+from core.entropy import entropies_from_counts, pattern_histograms
+from data.config import (entropy_cache_path_en, entropy_cache_path_ar, cache_path_en, cache_path_ar,
+                         entropy_counts_path_en, entropy_counts_path_ar)
+
+MAGIC = b"WENT"
+VERSION = 1
+HEADER = struct.Struct("<4sH2sI32s")
+HEADER_SIZE = 64
+
+
+def entropy_cache_path(language):
+    if language == "en":
+        return entropy_cache_path_en
+    elif language == "ar":
+        return entropy_cache_path_ar
+    raise ValueError(f"Unsupported language: {language}")
+
+
+def json_entropy_cache_path(language):
+    """Path of the legacy JSON cache of a language."""
+    if language == "en":
+        return cache_path_en
+    elif language == "ar":
+        return cache_path_ar
+    raise ValueError(f"Unsupported language: {language}")
+
+
+def entropy_counts_path(language):
+    """Path of the pattern bucket counts the entropy cache of a language is built from."""
+    if language == "en":
+        return entropy_counts_path_en
+    elif language == "ar":
+        return entropy_counts_path_ar
+    raise ValueError(f"Unsupported language: {language}")
+
+
+def save_entropy_cache(path, language, content_hash, entropies):
+    """
+    Write entropies (one per word, in word-list order) with a header identifying the word list.
+    """
+    entropies = np.asarray(entropies, dtype="<f4")
+    header = HEADER.pack(MAGIC, VERSION, language.encode("ascii"), len(entropies), bytes.fromhex(content_hash))
+
+    def write(f):
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        f.write(entropies.tobytes())
+    _write_atomically(path, write)
+
+
+def _write_atomically(path, write):
+    """
+    Call write(f) on a temporary file next to `path`, then move it over `path`.
+
+    A process stopped mid-write (e.g. a daemon thread at interpreter exit) leaves the
+    previous file, or none, instead of a truncated one.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        # mkstemp creates the file readable by its owner only.
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def read_entropy_cache_header(path):
+    """
+    Return the header of a binary entropy cache as a dict, or None if the file is not one.
+    """
+    with open(path, "rb") as f:
+        data = f.read(HEADER.size)
+    if len(data) < HEADER.size:
+        return None
+    magic, version, language, count, digest = HEADER.unpack(data)
+    if magic != MAGIC or version != VERSION:
+        return None
+    return {"language": language.decode("ascii"), "count": count, "hash": digest.hex()}
+
+
+def load_entropy_cache(path, language, content_hash):
+    """
+    Memory-map a binary entropy cache.
+
+    Returns None if the file does not exist, was written for another language or word list,
+    or is truncated.
+    """
+    if not os.path.exists(path):
+        return None
+    header = read_entropy_cache_header(path)
+    if header is None or header["language"] != language or header["hash"] != content_hash:
+        print(f"Ignoring stale entropy cache {path}")
+        return None
+    if os.path.getsize(path) != HEADER_SIZE + 4 * header["count"]:
+        print(f"Ignoring truncated entropy cache {path}")
+        return None
+    return np.memmap(path, dtype="<f4", mode="r", offset=HEADER_SIZE, shape=(header["count"],))
+
+
+def import_json_entropy_cache(path, words):
+    """
+    Read a legacy JSON cache (word -> entropy) into a float32 array aligned to `words`.
+
+    Returns None if the JSON was not computed for exactly these words.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        cache = json.load(f)
+    if set(cache) != set(words):
+        print(f"Ignoring stale entropy cache {path}: it does not cover the current word list")
+        return None
+    return np.array([cache[word] for word in words], dtype=np.float32)
+
+
+def save_pattern_counts(path, words, counts):
+    def write(f):
+        np.savez_compressed(f, words=np.array(words), counts=counts.astype(np.uint32))
+    _write_atomically(path, write)
+
+
+def load_pattern_counts(path):
+    """Return (words, counts) saved by save_pattern_counts(), or None if there are none or they are unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            return data["words"].tolist(), data["counts"].astype(np.int64)
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        print(f"Ignoring unreadable pattern counts {path}")
+        return None
+
+
+def update_pattern_counts(old_words, old_counts, words):
+    """
+    Turn the pattern bucket counts of one word list into those of another.
+
+    Rows of words present in both lists are corrected by the counts over the answers
+    that were removed and added; only the rows of new words are computed in full.
+
+    Args:
+        old_words (list): The word list old_counts was computed for.
+        old_counts (np.ndarray): (len(old_words), 243) counts over old_words as answers.
+        words (list): The new word list.
+
+    Returns:
+        np.ndarray: (len(words), 243) counts over words as answers.
+    """
+    old_index = {word: i for i, word in enumerate(old_words)}
+    new_set = set(words)
+    kept = [i for i, word in enumerate(words) if word in old_index]
+    added = [i for i, word in enumerate(words) if word not in old_index]
+    removed = [word for word in old_words if word not in new_set]
+
+    # Both lists share one letter encoding; the feedback kernel only compares ids.
+    alphabet = _alphabet(old_words + words)
+    encoded = _encode(words, alphabet)
+    counts = np.zeros((len(words), old_counts.shape[1]), dtype=np.int64)
+    counts[kept] = old_counts[[old_index[words[i]] for i in kept]]
+    if removed:
+        counts[kept] -= pattern_histograms(encoded[kept], _encode(removed, alphabet))
+    if added:
+        counts[kept] += pattern_histograms(encoded[kept], encoded[added])
+        counts[added] = pattern_histograms(encoded[added], encoded)
+    return counts
+
+
+def build_entropy_cache(language, words, engine=None, path=None):
+    """
+    Compute and save the entropy cache (and its pattern counts) for a word list.
+
+    The counts saved by the previous build are updated incrementally when they exist.
+    Otherwise every row is computed, with the engine's pattern matrix if one is given.
+
+    Args:
+        language (str): "en" or "ar".
+        words (list): The word list, in file order.
+        engine (EntropyEngine): Engine over the same word list, used for a full build.
+        path (str): Where to write the cache (default: the language's cache path).
+
+    Returns:
+        np.ndarray: The float32 entropies, in word-list order.
+    """
+    counts_path = entropy_counts_path(language)
+    previous = load_pattern_counts(counts_path)
+    if previous is not None and previous[0] == list(words):
+        counts = previous[1]
+    elif previous is not None:
+        old_words, old_counts = previous
+        print(f"Updating pattern counts incrementally ({len(old_words)} -> {len(words)} words) ...")
+        counts = update_pattern_counts(old_words, old_counts, list(words))
+    elif engine is not None:
+        all_ids = np.arange(len(words))
+        counts = engine.pattern_counts(all_ids, all_ids)
+    else:
+        encoded = _encode(words, _alphabet(words))
+        counts = pattern_histograms(encoded, encoded)
+    save_pattern_counts(counts_path, words, counts)
+
+    entropies = entropies_from_counts(counts).astype(np.float32)
+    save_entropy_cache(path or entropy_cache_path(language), language, word_list_hash(words), entropies)
+    return entropies
+
+
+def _alphabet(words):
+    return {letter: i for i, letter in enumerate(sorted(set("".join(words))))}
+
+
+def _encode(words, alphabet):
+    encoded = np.array([[alphabet[letter] for letter in word] for word in words], dtype=np.uint8)
+    return encoded.reshape(len(words), -1)
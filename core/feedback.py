@@ -0,0 +1,152 @@
+"""
+Feedback
+--------
+Wordle feedback packed into a single base-3 integer.
+
+Each position contributes one digit (0 = grey, 1 = yellow, 2 = green) and
+position i carries the weight 3**i, so every 5-letter feedback fits in a
+value between 0 and 242. The code fits in a uint8, which is what makes the
+precomputed guess x answer pattern matrix affordable.
+
+This is the one feedback representation shared by every agent. Color names
+('green', 'yellow', 'grey') only exist at the UI boundary, through
+as_color_names() and color_name().
+"""
+
+import numpy as np
+
+GREY = 0
+YELLOW = 1
+GREEN = 2
+
+WORD_LENGTH = 5
+NUM_PATTERNS = 3 ** WORD_LENGTH
+ALL_GREEN = NUM_PATTERNS - 1
+
+COLOR_NAMES = ('grey', 'yellow', 'green')
+COLOR_VALUES = {name: value for value, name in enumerate(COLOR_NAMES)}
+
+
+def compute_feedback_code(guess, answer):
+    """
+    Compute the Wordle feedback code for a guess against an answer.
+
+    Uses the same two-pass rule as the agents: greens are marked first and
+    consume their letter, then the remaining guess letters are marked yellow
+    from left to right while unmatched copies of that letter are left.
+
+    Args:
+        guess (str): The guessed word.
+        answer (str): The actual answer word.
+
+    Returns:
+        int: The base-3 feedback code.
+    """
+    answer_freq = {}
+    greens = [False] * WORD_LENGTH
+    code = 0
+    for i in range(WORD_LENGTH):
+        if guess[i] == answer[i]:
+            greens[i] = True
+            code += GREEN * 3 ** i
+        else:
+            answer_freq[answer[i]] = answer_freq.get(answer[i], 0) + 1
+
+    for i in range(WORD_LENGTH):
+        if not greens[i] and answer_freq.get(guess[i], 0) > 0:
+            answer_freq[guess[i]] -= 1
+            code += YELLOW * 3 ** i
+    return code
+
+
+def feedback_codes(guesses, answers):
+    """
+    Vectorized compute_feedback_code over letter-encoded words.
+
+    Words are arrays of letter ids whose last axis has length 5 (see
+    Corpus.encode). The leading axes broadcast against each other, so one
+    guess of shape (5,) against answers of shape (N, 5) yields N codes, and
+    guesses of shape (G, 1, 5) against answers of shape (C, 5) yield a
+    (G, C) block. Duplicate letters follow the same two-pass rule as
+    compute_feedback_code.
+
+    Args:
+        guesses (np.ndarray): Encoded guess word(s).
+        answers (np.ndarray): Encoded answer word(s).
+
+    Returns:
+        np.ndarray: The uint8 feedback codes, with the broadcast leading shape.
+    """
+    guesses = np.asarray(guesses)
+    answers = np.asarray(answers)
+    green = guesses == answers
+    # Answer letters left over for yellows once the greens are taken.
+    unmatched = ~green
+
+    codes = np.zeros(green.shape[:-1], dtype=np.uint8)
+    yellows = []
+    for i in range(WORD_LENGTH):
+        letter = guesses[..., i:i + 1]
+        available = ((answers == letter) & unmatched).sum(axis=-1)
+        # Earlier yellows of the same letter have already consumed copies.
+        used = np.zeros_like(available)
+        for k in range(i):
+            used += (guesses[..., k] == guesses[..., i]) & yellows[k]
+        yellow = ~green[..., i] & (available > used)
+        yellows.append(yellow)
+        codes += green[..., i] * np.uint8(GREEN * 3 ** i)
+        codes += yellow * np.uint8(YELLOW * 3 ** i)
+    return codes
+
+
+def encode_feedback(feedback):
+    """
+    Convert a sequence of colors (names such as 'green', or digits 0-2) into a code.
+    """
+    code = 0
+    for i, color in enumerate(feedback):
+        code += (COLOR_VALUES[color] if isinstance(color, str) else int(color)) * 3 ** i
+    return code
+
+
+def as_feedback_code(feedback):
+    """
+    Return feedback as a code, whether it already is one or is a sequence of colors.
+    """
+    if isinstance(feedback, (int, np.integer)):
+        return int(feedback)
+    return encode_feedback(feedback)
+
+
+def as_color_names(feedback):
+    """
+    Return feedback as a tuple of color names, whether it is a code or a sequence of colors.
+    """
+    if isinstance(feedback, (int, np.integer)):
+        return FEEDBACK_COLORS[feedback]
+    return tuple(color_name(color) for color in feedback)
+
+
+def color_name(color):
+    """Return the name of a single cell color given as a name or a digit 0-2."""
+    if isinstance(color, str):
+        return color
+    return COLOR_NAMES[color]
+
+
+def _decode(code):
+    colors = []
+    for _ in range(WORD_LENGTH):
+        colors.append(COLOR_NAMES[code % 3])
+        code //= 3
+    return tuple(colors)
+
+
+# Every code decoded once, so lookups at the string boundary are a tuple index.
+FEEDBACK_COLORS = tuple(_decode(code) for code in range(NUM_PATTERNS))
+
+# FEEDBACK_DIGITS[code] holds the per-position digits of a code.
+FEEDBACK_DIGITS = np.array([[COLOR_VALUES[name] for name in colors] for colors in FEEDBACK_COLORS], dtype=np.uint8)
+
+# MISMATCHES[a][b] is the number of positions in which codes a and b disagree.
+MISMATCHES = (FEEDBACK_DIGITS[:, None, :] != FEEDBACK_DIGITS[None, :, :]).sum(axis=-1).tolist()
@@ -0,0 +1,75 @@
+"""
+Move Cache
+----------
+Moves already chosen by deterministic agents, by game position.
+
+Games of a deterministic agent keep reaching the same positions: the entropy
+agent always opens with the same word, so every game with the same first
+feedback asks for the same second move. A position is identified by its
+candidate pool (different feedback histories that leave the same pool are
+the same position), and the cache maps it to what the agent chose there.
+
+Caches are shared by every agent of the same kind and language in a process,
+so a benchmark worker reuses moves across all of its games. They are bounded
+and evict the least recently used position first.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+
+def position_key(pool):
+    """Return a hashable key identifying a candidate pool exactly."""
+    return len(pool.mask), np.packbits(pool.mask).tobytes()
+
+
+class MoveCache:
+    # Upper bound on cached positions; a key is one bit per corpus word.
+    MAX_SIZE = 4096
+
+    def __init__(self, max_size=MAX_SIZE):
+        self.max_size = max_size
+        self._moves = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._moves)
+
+    def get(self, key):
+        """Return the move cached for a position, or None."""
+        move = self._moves.get(key)
+        if move is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._moves.move_to_end(key)
+        return move
+
+    def put(self, key, move):
+        self._moves[key] = move
+        self._moves.move_to_end(key)
+        if len(self._moves) > self.max_size:
+            self._moves.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop every cached move and reset the counters."""
+        self._moves.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        return {"size": len(self), "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_caches = {}
+
+
+def get_move_cache(language, agent_name):
+    """Return the shared MoveCache of an agent kind (e.g. "Entropy") and language."""
+    key = (language, agent_name)
+    if key not in _caches:
+        _caches[key] = MoveCache()
+    return _caches[key]
@@ -0,0 +1,132 @@
+"""
+Opening Book
+------------
+Precomputed early moves of the entropy agent.
+
+The entropy agent always opens with the same word, so its second move
+depends only on the first feedback, and its third move only on the first
+two. The book stores those moves, keyed by the feedback codes seen so far,
+so the most expensive moves of a game become dictionary lookups.
+
+Books are built offline by data/build_opening_book.py and saved as JSON:
+
+    {"language": "en", "word_list_hash": "9f2c...", "first": "tares",
+     "moves": {"0": "doily", "0,0": "human", ...}}
+"""
+
+import json
+import os
+
+from tqdm import tqdm
+
+from core.feedback import ALL_GREEN
+from data.config import opening_book_path_en, opening_book_path_ar
+
+
+def opening_book_path(language):
+    if language == "en":
+        return opening_book_path_en
+    elif language == "ar":
+        return opening_book_path_ar
+    raise ValueError(f"Unsupported language: {language}")
+
+
+def _key(codes):
+    return ",".join(str(code) for code in codes)
+
+
+class OpeningBook:
+    def __init__(self, first, moves):
+        """
+        Args:
+            first (str): The opening guess the book was built from.
+            moves (dict): Maps comma-joined feedback codes to the next guess.
+        """
+        self.first = first
+        self.moves = moves
+
+    def lookup(self, history):
+        """
+        Return the book move after a sequence of (guess, feedback code) pairs, or None.
+
+        The history must follow the book's own line of play; after any other guess
+        the book has nothing to say.
+        """
+        if not history or history[0][0] != self.first:
+            return None
+        codes = []
+        for i, (guess, code) in enumerate(history):
+            if i > 0 and guess != self.moves.get(_key(codes)):
+                return None
+            codes.append(code)
+        return self.moves.get(_key(codes))
+
+
+def build_opening_book(agent, depth=3):
+    """
+    Record an entropy agent's moves for every feedback its opening lines can receive.
+
+    Args:
+        agent (EntropyAgent): The agent to record, with its own opening book disabled.
+        depth (int): The last move number to record (2 = second guesses only, 3 = also third).
+
+    Returns:
+        OpeningBook: The recorded book.
+    """
+    agent.reset()
+    first = agent.get_guess()
+    moves = {}
+    _record_replies(agent, first, [], depth - 1, moves)
+    agent.reset()
+    return OpeningBook(first, moves)
+
+
+def _record_replies(agent, guess, codes, depth, moves):
+    # Every feedback the remaining candidates can give to `guess`, except the win.
+    replies = set(agent.patterns.row(guess)[agent.pool.ids()].tolist())
+    replies.discard(ALL_GREEN)
+    replies = sorted(replies)
+    if not codes:
+        replies = tqdm(replies, desc="Opening book", unit="pattern")
+    state = agent.get_state()
+    for code in replies:
+        agent.update(guess, code)
+        reply = agent.get_guess()
+        moves[_key(codes + [code])] = reply
+        if depth > 1 and len(agent.pool) > 1:
+            _record_replies(agent, reply, codes + [code], depth - 1, moves)
+        # Back to the position before this feedback.
+        agent.set_state(state)
+
+
+def save_opening_book(book, path, language, content_hash):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"language": language, "word_list_hash": content_hash, "first": book.first, "moves": book.moves},
+                  f, ensure_ascii=False)
+
+
+def load_opening_book(path, content_hash):
+    """
+    Load a saved opening book.
+
+    Returns None if the file does not exist or was built for a different word list.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("word_list_hash") != content_hash:
+        print(f"Ignoring stale opening book {path}: built for a different word list")
+        return None
+    return OpeningBook(data["first"], data["moves"])
+
+
+_books = {}
+
+
+def get_opening_book(language="en"):
+    """Return the shared opening book for a language (None if none was built)."""
+    if language not in _books:
+        from core.corpus import get_corpus
+        _books[language] = load_opening_book(opening_book_path(language), get_corpus(language).content_hash)
+    return _books[language]
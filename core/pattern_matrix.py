@@ -0,0 +1,184 @@
+"""
+Pattern Matrix
+--------------
+Precomputed feedback codes for every (guess, answer) pair of a language.
+
+Row g, column a of the matrix holds compute_feedback_code(words[g], words[a])
+as a uint8. The matrix is built offline (data/build_pattern_matrix.py) with the vectorized kernel, saved
+as a .npy file and memory-mapped at load, so looking up feedback costs an
+array index instead of a Python feedback computation. A .sha256 file next to
+it records the word list the matrix was built for.
+"""
+
+import os
+from collections import OrderedDict
+
+import numpy as np
+from tqdm import tqdm
+
+from core.corpus import get_corpus
+from core.feedback import compute_feedback_code, feedback_codes
+from data.config import pattern_matrix_path_en, pattern_matrix_path_ar
+
+
+def pattern_matrix_path(language):
+    if language == "en":
+        return pattern_matrix_path_en
+    elif language == "ar":
+        return pattern_matrix_path_ar
+    raise ValueError(f"Unsupported language: {language}")
+
+
+def build_pattern_matrix(corpus, block_size=64):
+    """
+    Compute the full guess x answer feedback matrix for a corpus.
+
+    Rows are filled a block of guesses at a time with the vectorized kernel.
+
+    Args:
+        corpus (Corpus): The corpus; its words are used both as guesses and answers.
+        block_size (int): Number of guess rows computed per kernel call.
+
+    Returns:
+        np.ndarray: A (len(corpus), len(corpus)) uint8 array of feedback codes.
+    """
+    n = len(corpus)
+    encoded = corpus.encoded
+    matrix = np.empty((n, n), dtype=np.uint8)
+    for start in tqdm(range(0, n, block_size), desc="Computing patterns", unit="block"):
+        stop = min(start + block_size, n)
+        matrix[start:stop] = feedback_codes(encoded[start:stop, None, :], encoded[None, :, :])
+    return matrix
+
+
+def _hash_path(path):
+    return os.path.splitext(path)[0] + ".sha256"
+
+
+def save_pattern_matrix(matrix, path, content_hash):
+    np.save(path, matrix)
+    with open(_hash_path(path), "w") as f:
+        f.write(content_hash)
+
+
+def load_pattern_matrix(path, size, content_hash):
+    """
+    Memory-map a saved pattern matrix.
+
+    Returns None if the file does not exist or was built for a different word list
+    (see Corpus.content_hash), in which case callers fall back to computing feedback.
+    """
+    if not os.path.exists(path):
+        return None
+    saved_hash = None
+    if os.path.exists(_hash_path(path)):
+        with open(_hash_path(path)) as f:
+            saved_hash = f.read().strip()
+    if saved_hash != content_hash:
+        print(f"Ignoring stale pattern matrix {path}: built for a different word list")
+        return None
+    matrix = np.load(path, mmap_mode="r")
+    if matrix.shape != (size, size):
+        print(f"Ignoring stale pattern matrix {path}: shape {matrix.shape}, expected {(size, size)}")
+        return None
+    return matrix
+
+
+class PatternTable:
+    # Upper bound on cached (guess, pattern) masks; each one is a bool per corpus word.
+    MASK_CACHE_SIZE = 4096
+
+    def __init__(self, corpus, matrix=None):
+        """
+        Feedback lookup for one language.
+
+        Args:
+            corpus (Corpus): The language's corpus; matrix rows/columns follow its order.
+            matrix (np.ndarray): The precomputed pattern matrix, or None to compute on demand.
+        """
+        self.corpus = corpus
+        self.matrix = matrix
+        self._masks = OrderedDict()
+
+    def _matrix_id(self, word):
+        # Index of a word's matrix row/column, or None if the matrix does not cover it.
+        i = self.corpus.id_of(word)
+        if self.matrix is None or i is None or i >= self.corpus.base_size:
+            return None
+        return i
+
+    def has_row(self, guess):
+        """True if the guess's feedback codes are read from the matrix rather than computed."""
+        return self._matrix_id(guess) is not None
+
+    def code(self, guess, answer):
+        """Return the feedback code for a single (guess, answer) pair."""
+        g = self._matrix_id(guess)
+        a = self._matrix_id(answer)
+        if g is not None and a is not None:
+            return int(self.matrix[g, a])
+        return compute_feedback_code(guess, answer)
+
+    def row(self, guess):
+        """
+        Return the feedback codes of a guess against every corpus word, in corpus order.
+
+        The matrix row is used when there is one; the vectorized kernel fills in the rest
+        (no matrix built, a guess added at runtime, or answers added at runtime).
+        """
+        g = self._matrix_id(guess)
+        if g is None:
+            return feedback_codes(self.corpus.encode_word(guess), self.corpus.encoded)
+        row = self.matrix[g]
+        base = self.corpus.base_size
+        if len(self.corpus) > base:
+            extra = feedback_codes(self.corpus.encode_word(guess), self.corpus.encoded[base:])
+            row = np.concatenate([row, extra])
+        return row
+
+    def block(self, guess_ids, answer_ids):
+        """
+        Return the (len(guess_ids), len(answer_ids)) block of feedback codes for corpus indices.
+        """
+        guess_ids = np.asarray(guess_ids)
+        answer_ids = np.asarray(answer_ids)
+        base = self.corpus.base_size
+        if self.matrix is not None and (guess_ids < base).all() and (answer_ids < base).all():
+            if len(guess_ids) > 1 and (np.diff(guess_ids) == 1).all():
+                # A contiguous run of guesses (the usual case) is a slice of the matrix, not a copy.
+                rows = self.matrix[guess_ids[0]:guess_ids[-1] + 1]
+            else:
+                rows = self.matrix[guess_ids]
+            return np.take(rows, answer_ids, axis=1)
+        encoded = self.corpus.encoded
+        return feedback_codes(encoded[guess_ids][:, None, :], encoded[answer_ids][None, :, :])
+
+    def mask(self, guess, code):
+        """
+        Return a boolean mask over the corpus of the answers for which `guess` gets feedback `code`.
+
+        Masks are cached per (guess, code), so filtering a candidate set after a guess
+        is a single AND.
+        """
+        key = (guess, code, len(self.corpus))
+        mask = self._masks.get(key)
+        if mask is None:
+            mask = self.row(guess) == code
+            self._masks[key] = mask
+            if len(self._masks) > self.MASK_CACHE_SIZE:
+                self._masks.popitem(last=False)
+        else:
+            self._masks.move_to_end(key)
+        return mask
+
+
+_tables = {}
+
+
+def get_pattern_table(language="en"):
+    """Return the shared PatternTable for a language, memory-mapping its matrix on first use."""
+    if language not in _tables:
+        corpus = get_corpus(language)
+        matrix = load_pattern_matrix(pattern_matrix_path(language), corpus.base_size, corpus.content_hash)
+        _tables[language] = PatternTable(corpus, matrix)
+    return _tables[language]
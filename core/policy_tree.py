@@ -0,0 +1,156 @@
+"""
+Policy Tree
+-----------
+The complete decision tree of a deterministic agent.
+
+An agent whose guesses depend only on the feedback seen so far (the entropy
+agent, or the frequency agent with a fixed tie-break) plays every game along
+one path of a tree: each node holds the guess to play, and each feedback
+code leads to a child node. Walking every secret of the word list through
+the agent records the whole tree, so replaying it costs one dictionary
+lookup per move (see agents/policy_agent.py).
+
+Trees are built offline by data/build_policy_tree.py and saved as .npz:
+
+    guesses      (nodes,)   word id played at each node; node 0 is the root
+    edge_keys    (edges,)   parent * 243 + feedback code
+    edge_nodes   (edges,)   the child node reached by that feedback
+    depths       (words,)   guesses the agent needs for each secret
+    word_list_hash          the word list the tree was built for
+"""
+
+import os
+from collections import Counter
+
+import numpy as np
+from tqdm import tqdm
+
+from core.feedback import ALL_GREEN, NUM_PATTERNS
+from data.config import policy_tree_dir
+
+MAX_GUESSES = 6
+
+
+def policy_tree_path(language, policy):
+    if language not in ("en", "ar"):
+        raise ValueError(f"Unsupported language: {language}")
+    return os.path.join(policy_tree_dir, f"policy_{policy}_{language}.npz")
+
+
+class PolicyTree:
+    def __init__(self, guesses, edge_keys, edge_nodes, depths):
+        """
+        Args:
+            guesses (np.ndarray): The word id guessed at each node.
+            edge_keys (np.ndarray): parent * 243 + code for each edge.
+            edge_nodes (np.ndarray): The child node of each edge.
+            depths (np.ndarray): Number of guesses needed for each secret, by word id.
+        """
+        self.guesses = guesses
+        self.depths = depths
+        self.edge_keys = edge_keys
+        self.edge_nodes = edge_nodes
+        self.children = dict(zip(edge_keys.tolist(), edge_nodes.tolist()))
+
+    def guess(self, node):
+        """Return the word id to play at a node."""
+        return int(self.guesses[node])
+
+    def child(self, node, code):
+        """Return the node reached from `node` after feedback `code`, or None if the tree has none."""
+        return self.children.get(node * NUM_PATTERNS + code)
+
+    def histogram(self):
+        """Return {number of guesses: number of secrets solved in that many guesses}."""
+        walked = self.depths[self.depths > 0]
+        return dict(sorted(Counter(walked.tolist()).items()))
+
+    def failures(self, max_guesses=MAX_GUESSES):
+        """Return the word ids of the secrets not solved within max_guesses."""
+        return np.flatnonzero(self.depths > max_guesses)
+
+
+def build_policy_tree(agent, secret_ids=None):
+    """
+    Record an agent's complete policy by playing every secret through it at once.
+
+    Each node partitions the secrets that reach it by the feedback its guess gets,
+    and every part continues from a copy of the agent's state (get_state/set_state).
+
+    Args:
+        agent (BaseAgent): A deterministic agent (its guesses depend only on the feedback).
+        secret_ids (np.ndarray): The secrets to walk, as word ids (default: every word).
+
+    Returns:
+        PolicyTree: The recorded tree.
+    """
+    corpus = agent.corpus
+    if secret_ids is None:
+        secret_ids = np.arange(len(corpus))
+    guesses = []
+    edges = []
+    depths = np.zeros(len(corpus), dtype=np.int16)
+    agent.reset()
+    progress = tqdm(total=len(secret_ids), desc="Policy tree", unit="secret")
+    _walk(agent, np.asarray(secret_ids), 1, guesses, edges, depths, progress)
+    progress.close()
+    agent.reset()
+
+    edges.sort()
+    return PolicyTree(
+        np.array(guesses, dtype=np.int32),
+        np.array([key for key, _ in edges], dtype=np.int64),
+        np.array([node for _, node in edges], dtype=np.int32),
+        depths,
+    )
+
+
+def _walk(agent, secret_ids, depth, guesses, edges, depths, progress):
+    guess = agent.get_guess()
+    node = len(guesses)
+    guesses.append(agent.corpus.id_of(guess))
+    codes = agent.patterns.row(guess)[secret_ids]
+    state = agent.get_state()
+    for code in np.unique(codes).tolist():
+        reached = secret_ids[codes == code]
+        if code == ALL_GREEN:
+            depths[reached] = depth
+            progress.update(len(reached))
+            continue
+        agent.update(guess, code)
+        child = _walk(agent, reached, depth + 1, guesses, edges, depths, progress)
+        edges.append((node * NUM_PATTERNS + code, child))
+        agent.set_state(state)
+    return node
+
+
+def save_policy_tree(tree, path, content_hash):
+    np.savez(path, guesses=tree.guesses, edge_keys=tree.edge_keys, edge_nodes=tree.edge_nodes, depths=tree.depths,
+             word_list_hash=np.array(content_hash))
+
+
+def load_policy_tree(path, content_hash):
+    """
+    Load a saved policy tree.
+
+    Returns None if the file does not exist or was built for a different word list.
+    """
+    if not os.path.exists(path):
+        return None
+    with np.load(path) as data:
+        if "word_list_hash" not in data or str(data["word_list_hash"]) != content_hash:
+            print(f"Ignoring stale policy tree {path}: built for a different word list")
+            return None
+        return PolicyTree(data["guesses"], data["edge_keys"], data["edge_nodes"], data["depths"])
+
+
+_trees = {}
+
+
+def get_policy_tree(language, policy):
+    """Return the shared policy tree of an agent for a language (None if none was built)."""
+    if (language, policy) not in _trees:
+        from core.corpus import get_corpus
+        path = policy_tree_path(language, policy)
+        _trees[(language, policy)] = load_policy_tree(path, get_corpus(language).content_hash)
+    return _trees[(language, policy)]
@@ -6,6 +6,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')
 
 from utils.file_processing import save_word_list, load_word_list
 from data.config import all_words_arabic_path, words_to_add_path
+from core.entropy_cache import build_entropy_cache
 
 new = load_word_list(words_to_add_path)
 current = load_word_list(all_words_arabic_path)
@@ -16,4 +17,8 @@ for word in new:
 
 current.sort()
 save_word_list(all_words_arabic_path, current)
-save_word_list(words_to_add_path, [])
\ No newline at end of file
+save_word_list(words_to_add_path, [])
+
+# The word list changed: bring the entropy cache up to date (incrementally, from the saved pattern counts).
+# The pattern matrix, opening book and policy trees are ignored until rebuilt by their data/build_*.py scripts.
+build_entropy_cache("ar", load_word_list(all_words_arabic_path))
@@ -0,0 +1,17 @@
+import sys
+import os
+
+# Add the root project directory to sys.path so we can access 'core' and 'agents'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.entropy_agent import EntropyAgent
+from core.opening_book import build_opening_book, save_opening_book, opening_book_path
+
+# Record the entropy agent's second and third guesses for each language.
+for language in ("en", "ar"):
+    agent = EntropyAgent(language=language, use_opening_book=False)
+    print(f"\nBuilding opening book for language='{language}' ...\n")
+    book = build_opening_book(agent, depth=3)
+    path = opening_book_path(language)
+    save_opening_book(book, path, language, agent.corpus.content_hash)
+    print(f"Saved {path} (first guess '{book.first}', {len(book.moves)} moves)")
@@ -0,0 +1,16 @@
+import sys
+import os
+
+# Add the root project directory to sys.path so we can access 'core'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.corpus import get_corpus
+from core.pattern_matrix import build_pattern_matrix, save_pattern_matrix, pattern_matrix_path
+
+# Build the guess x answer feedback matrix for each language.
+for language in ("en", "ar"):
+    corpus = get_corpus(language)
+    print(f"\nBuilding pattern matrix for language='{language}' ({len(corpus)} words) ...\n")
+    matrix = build_pattern_matrix(corpus)
+    save_pattern_matrix(matrix, pattern_matrix_path(language), corpus.content_hash)
+    print(f"Saved {pattern_matrix_path(language)}")
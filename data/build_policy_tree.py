@@ -0,0 +1,24 @@
+import sys
+import os
+
+# Add the root project directory to sys.path so we can access 'core' and 'agents'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.policy_agent import POLICIES
+from core.policy_tree import build_policy_tree, save_policy_tree, policy_tree_path, MAX_GUESSES
+
+# Record the complete policy of each deterministic agent, walking every word of the list as the secret.
+for language in ("en", "ar"):
+    for policy, make_agent in POLICIES.items():
+        agent = make_agent(language)
+        print(f"\nBuilding policy tree for policy='{policy}', language='{language}' ...\n")
+        tree = build_policy_tree(agent)
+        path = policy_tree_path(language, policy)
+        save_policy_tree(tree, path, agent.corpus.content_hash)
+        print(f"Saved {path} ({len(tree.guesses)} nodes)")
+
+        histogram = tree.histogram()
+        print("Guesses needed: " + ", ".join(f"{depth}: {count}" for depth, count in histogram.items()))
+        print(f"Worst case: {max(histogram)} guesses")
+        failures = [agent.corpus.words[i] for i in tree.failures()]
+        print(f"Not solved within {MAX_GUESSES} guesses ({len(failures)}): {' '.join(failures)}")
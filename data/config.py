@@ -3,16 +3,69 @@ from utils.file_processing import load_word_list
 
 # Dynamically build the path to the all_words.txt file
 current_dir = os.path.dirname(os.path.abspath(__file__))  # Gets the directory of the current script
-english_all_words_path = os.path.join(current_dir, '..', r'data\english', 'english_all_words.txt') 
-english_game_words_path = os.path.join(current_dir, '..', r'data\english', 'english_game_words.txt')
-all_words_arabic_path = os.path.join(current_dir, '..', r'data\arabic', 'arabic_words.txt')
-words_to_add_path = os.path.join(current_dir, '..', r'data\arabic', 'words_to_add.txt')
+english_all_words_path = os.path.join(current_dir, '..', 'data', 'english', 'english_all_words.txt') 
+english_game_words_path = os.path.join(current_dir, '..', 'data', 'english', 'english_game_words.txt')
+all_words_arabic_path = os.path.join(current_dir, '..', 'data', 'arabic', 'arabic_words.txt')
+words_to_add_path = os.path.join(current_dir, '..', 'data', 'arabic', 'words_to_add.txt')
 
 cache_path_en = os.path.join(current_dir, '..', 'data', 'entropy_cache_en.json')
 cache_path_ar = os.path.join(current_dir, '..', 'data', 'entropy_cache_ar.json')
+# Binary entropy caches (see core/entropy_cache.py); the JSON caches above are only imported once.
+entropy_cache_path_en = os.path.join(current_dir, '..', 'data', 'entropy_cache_en.bin')
+entropy_cache_path_ar = os.path.join(current_dir, '..', 'data', 'entropy_cache_ar.bin')
+# Per-word pattern bucket counts the binary caches were computed from, for incremental rebuilds.
+entropy_counts_path_en = os.path.join(current_dir, '..', 'data', 'entropy_counts_en.npz')
+entropy_counts_path_ar = os.path.join(current_dir, '..', 'data', 'entropy_counts_ar.npz')
+
+# Precomputed guess x answer feedback codes, built offline by data/build_pattern_matrix.py
+pattern_matrix_path_en = os.path.join(current_dir, '..', 'data', 'pattern_matrix_en.npy')
+pattern_matrix_path_ar = os.path.join(current_dir, '..', 'data', 'pattern_matrix_ar.npy')
+
+# Entropy agent's early moves per first-move feedback, built offline by data/build_opening_book.py
+opening_book_path_en = os.path.join(current_dir, '..', 'data', 'opening_book_en.json')
+opening_book_path_ar = os.path.join(current_dir, '..', 'data', 'opening_book_ar.json')
+
+# Complete decision trees of the deterministic agents, built offline by data/build_policy_tree.py
+policy_tree_dir = os.path.join(current_dir, '..', 'data')
 # I changed path dont forget
-ALL_WORDS_ENGLISH = load_word_list(english_all_words_path)
-GAME_WORDS_ENGLISH = load_word_list(english_game_words_path)
+# Word lists are read on first use, not at import: a process that only plays English
+# never opens the Arabic file. ALL_WORDS_ENGLISH, GAME_WORDS_ENGLISH and ALL_WORDS_ARABIC
+# are still available as module attributes through __getattr__ below.
+_word_list_paths = {
+    ("en", "all"): english_all_words_path,
+    ("en", "game"): english_game_words_path,
+    ("ar", "all"): all_words_arabic_path,
+}
+_word_lists = {}
+
+
+def get_word_list(language="en", kind="all"):
+    """
+    Return a word list, reading it from disk on first use.
+
+    Args:
+        language (str): "en" or "ar".
+        kind (str): "all" for every allowed word, "game" for the English answer list.
+    """
+    key = (language, kind)
+    if key not in _word_lists:
+        if key not in _word_list_paths:
+            raise ValueError(f"Unsupported word list: language={language!r}, kind={kind!r}")
+        _word_lists[key] = load_word_list(_word_list_paths[key])
+    return _word_lists[key]
+
+
+_lazy_word_lists = {
+    "ALL_WORDS_ENGLISH": ("en", "all"),
+    "GAME_WORDS_ENGLISH": ("en", "game"),
+    "ALL_WORDS_ARABIC": ("ar", "all"),
+}
+
+
+def __getattr__(name):
+    if name in _lazy_word_lists:
+        return get_word_list(*_lazy_word_lists[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-ALL_WORDS_ARABIC = load_word_list(all_words_arabic_path)
 ERROR_WORDS = []
@@ -21,4 +21,4 @@ if __name__ == "__main__":
     tested_agents = [BayesianAgent,CSP_agent,FrequencyAgent,BayesianAgent]
     
     
-    avg(100,100,tested_agents,'ar')
+    avg(100,100,tested_agents,'ar', workers=os.cpu_count())